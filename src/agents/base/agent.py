@@ -196,10 +196,10 @@ class BaseAgent(ABC):
             
             # Process the message
             if stream and self.supports_streaming:
-                response_content = ""
-                async for chunk in self.process_message_stream(message, session_id, context):
-                    response_content += chunk
-                response = AgentResponse(content=response_content)
+                chunks = [
+                    chunk async for chunk in self.process_message_stream(message, session_id, context)
+                ]
+                response = AgentResponse(content="".join(chunks))
             else:
                 response = await self._process_message(message, session_id, context or {})
             
@@ -228,6 +228,36 @@ class BaseAgent(ABC):
             logger.error(f"Error processing message in agent {self.id}: {str(e)}")
             raise
     
+    async def process_messages_batch(
+        self,
+        messages: List[str],
+        session_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[AgentResponse]:
+        """
+        Process several messages, overlapping their model calls where possible
+        
+        Args:
+            messages: The input messages
+            session_id: Shared session for all messages; when omitted each
+                message is independent and gets its own session
+            context: Additional context information passed to every message
+            
+        Returns:
+            AgentResponses in the same order as ``messages``
+        """
+        if session_id is not None:
+            # One conversation: later messages must see earlier replies
+            return [
+                await self.process_message(message, session_id, context)
+                for message in messages
+            ]
+        
+        return list(await asyncio.gather(*(
+            self.process_message(message, str(uuid4()), context)
+            for message in messages
+        )))
+    
     @abstractmethod
     async def _process_message(
         self,
@@ -348,6 +378,13 @@ class BaseAgent(ABC):
         self.supports_tools = True
         logger.info(f"Added tool '{tool.name}' to agent {self.id}")
     
+    def set_tools(self, tools: List[BaseTool]):
+        """Install a batch of tools, replacing any existing tools with the same names"""
+        tool_names = {tool.name for tool in tools}
+        self.tools = [tool for tool in self.tools if tool.name not in tool_names] + list(tools)
+        self.supports_tools = len(self.tools) > 0
+        logger.info(f"Set {len(tools)} tools on agent {self.id}")
+    
     def remove_tool(self, tool_name: str):
         """Remove a tool by name"""
         self.tools = [tool for tool in self.tools if tool.name != tool_name]
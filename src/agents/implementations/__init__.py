@@ -1,12 +1,33 @@
 # Agent implementations
-from .general_assistant_enhanced import GeneralAssistant
-from .summarizer_agent import SummarizerAgent  
-from .vision_agent import VisionAgent
-from .dummy_agent import DummyAgent
+#
+# Agents are imported on first access so that loading one implementation
+# module (as AgentManager does per file) does not import all of the others
+# and their model provider dependencies.
+import importlib
+
+_AGENT_MODULES = {
+    "GeneralAssistant": ".general_assistant_enhanced",
+    "SummarizerAgent": ".summarizer_agent",
+    "VisionAgent": ".vision_agent",
+    "DummyAgent": ".dummy_agent",
+}
 
 __all__ = [
     "GeneralAssistant",
-    "SummarizerAgent", 
+    "SummarizerAgent",
     "VisionAgent",
     "DummyAgent"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _AGENT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,6 +4,7 @@ Dummy Agent - A simple test agent for demonstration and testing purposes
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import random
+import re
 import asyncio
 import logging
 
@@ -11,6 +12,9 @@ from src.agents.base.agent import BaseAgent, AgentResponse
 
 logger = logging.getLogger(__name__)
 
+# Everything that is not a digit or basic arithmetic
+_NON_MATH_RE = re.compile(r'[^0-9+\-*/.() ]')
+
 
 class DummyAgent(BaseAgent):
     """
@@ -148,10 +152,8 @@ class DummyAgent(BaseAgent):
         try:
             # Simple math expression evaluation (be careful in production!)
             # Only allow basic operations for safety
-            import re
-            
             # Extract numbers and basic operators
-            math_expression = re.sub(r'[^0-9+\-*/.() ]', '', message)
+            math_expression = _NON_MATH_RE.sub('', message)
             
             if math_expression.strip():
                 # Very basic evaluation - only for demo purposes
@@ -3,6 +3,7 @@ Enhanced General Assistant Agent implementation with LangChain integration
 """
 from typing import Dict, List, Optional, Any
 import logging
+import re
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -15,6 +16,9 @@ from src.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Runs of digits and arithmetic operators in a user message
+_MATH_EXPRESSION_RE = re.compile(r'[\d+\-*/().]+')
+
 
 class GeneralAssistant(BaseAgent):
     """
@@ -84,7 +88,7 @@ class GeneralAssistant(BaseAgent):
         self.model_name = settings.openai_default_model if settings.openai_api_key else "phi3:mini"
         
         self.memory_manager = memory_manager
-        self.prompt_manager = PromptManager()
+        self.prompt_manager = PromptManager.instance()
         self.supports_streaming = True
         
         # Enhanced capabilities
@@ -138,8 +142,7 @@ class GeneralAssistant(BaseAgent):
                 if needs_calculation and self.get_tool_by_name("calculator"):
                     try:
                         # Extract mathematical expressions (simplified)
-                        import re
-                        math_expressions = re.findall(r'[\d+\-*/().]+', message)
+                        math_expressions = _MATH_EXPRESSION_RE.findall(message)
                         if math_expressions:
                             calc_result = await self.execute_tool("calculator", {"expression": math_expressions[0]})
                             response_content += f"Calculation result: {calc_result.get('result', 'Error')}\n\n"
@@ -250,7 +253,7 @@ class GeneralAssistant(BaseAgent):
         formatted = []
         for msg in messages:
             if hasattr(msg, 'content'):
-                role = "User" if msg.__class__.__name__ == "HumanMessage" else "Assistant"
+                role = "User" if isinstance(msg, HumanMessage) else "Assistant"
                 formatted.append(f"{role}: {msg.content}")
         return "\n".join(formatted)
     
@@ -23,8 +23,10 @@ Example:
 import asyncio
 import importlib
 import inspect
+import os
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 
 from loguru import logger
@@ -33,6 +35,10 @@ from src.agents.base.agent import BaseAgent
 from src.config.settings import get_settings
 
 
+# Process-wide manager shared by the application and workflows
+_agent_manager: Optional["AgentManager"] = None
+
+
 class AgentManager:
     """
     Central registry for managing all agents in the system
@@ -46,6 +52,21 @@ class AgentManager:
         self.agent_metadata: Dict[str, Dict[str, Any]] = {}
         self.settings = get_settings()
         
+        # Lowercased capability -> agent id -> times the agent lists it, so
+        # discovery matches each distinct capability once per query
+        self._capability_index: Dict[str, Counter] = defaultdict(Counter)
+        # Lowercased (name, description, agent_type, capabilities) per agent,
+        # as indexed at registration
+        self._search_text: Dict[str, Tuple[str, str, str, Tuple[str, ...]]] = {}
+    
+    @classmethod
+    def instance(cls) -> "AgentManager":
+        """Get the process-wide agent manager, creating it on first use"""
+        global _agent_manager
+        if _agent_manager is None:
+            _agent_manager = cls()
+        return _agent_manager
+        
     async def initialize(self):
         """Initialize the agent registry"""
         logger.info("Initializing Agent Registry...")
@@ -62,24 +83,38 @@ class AgentManager:
         
         # Load agents from the implementations directory
         agents_dir = Path("src/agents/implementations")
-        if not agents_dir.exists():
+        
+        # Scan for agent files in one directory read; scandir also serves
+        # as the existence check
+        try:
+            with os.scandir(agents_dir) as entries:
+                agent_files = sorted(
+                    agents_dir / entry.name for entry in entries
+                    if entry.name.endswith(".py")
+                    and not entry.name.startswith("_")
+                    and entry.is_file()
+                )
+        except FileNotFoundError:
             logger.warning(f"Agents directory not found: {agents_dir}")
             return
         
-        # Scan for agent files
-        for agent_file in agents_dir.glob("*.py"):
-            if agent_file.name.startswith("_"):
-                continue
-                
-            try:
-                await self._load_agent_from_file(agent_file)
-            except Exception as e:
-                logger.error(f"Failed to load agent from {agent_file}: {str(e)}")
+        # Agents initialize independently, so load them concurrently and
+        # register them in file order once all have finished
+        results = await asyncio.gather(
+            *(self._load_agent_from_file(agent_file) for agent_file in agent_files),
+            return_exceptions=True
+        )
+        for agent_file, result in zip(agent_files, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to load agent from {agent_file}: {str(result)}")
+            elif result is not None:
+                self._record_agent(result)
+                logger.info(f"Loaded agent: {result.id} ({result.name})")
         
         logger.info(f"Loaded {len(self.agents)} agents")
     
-    async def _load_agent_from_file(self, agent_file: Path):
-        """Load an agent from a Python file"""
+    async def _load_agent_from_file(self, agent_file: Path) -> Optional[BaseAgent]:
+        """Load and initialize the first agent class defined in a Python file"""
         module_name = f"src.agents.implementations.{agent_file.stem}"
         
         try:
@@ -95,30 +130,59 @@ class AgentManager:
                     # Instantiate the agent
                     agent_instance = obj()
                     await agent_instance.initialize()
-                    
-                    # Register the agent
-                    self.agents[agent_instance.id] = agent_instance
-                    self.agent_metadata[agent_instance.id] = {
-                        "name": agent_instance.name,
-                        "description": agent_instance.description,
-                        "agent_type": agent_instance.agent_type,
-                        "capabilities": agent_instance.capabilities,
-                        "model_provider": agent_instance.model_provider,
-                        "model_name": agent_instance.model_name,
-                        "status": "active",
-                        "supports_streaming": agent_instance.supports_streaming,
-                        "supports_multimodal": agent_instance.supports_multimodal,
-                        "created_at": datetime.now(),
-                        "updated_at": datetime.now(),
-                    }
-                    
-                    logger.info(f"Loaded agent: {agent_instance.id} ({agent_instance.name})")
-                    break
+                    return agent_instance
+            
+            return None
                     
         except Exception as e:
             logger.error(f"Error loading agent from {agent_file}: {str(e)}")
             raise
     
+    def _record_agent(self, agent: BaseAgent):
+        """Add an initialized agent and its metadata to the registry"""
+        self._unindex_agent(agent.id)
+        self.agents[agent.id] = agent
+        self.agent_metadata[agent.id] = {
+            "name": agent.name,
+            "description": agent.description,
+            "agent_type": agent.agent_type,
+            "capabilities": agent.capabilities,
+            "model_provider": agent.model_provider,
+            "model_name": agent.model_name,
+            "status": "active",
+            "supports_streaming": agent.supports_streaming,
+            "supports_multimodal": agent.supports_multimodal,
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+        }
+        
+        capabilities = tuple(capability.lower() for capability in agent.capabilities)
+        for capability in capabilities:
+            self._capability_index[capability][agent.id] += 1
+        self._search_text[agent.id] = (
+            agent.name.lower(),
+            agent.description.lower(),
+            agent.agent_type.lower(),
+            capabilities,
+        )
+    
+    def _forget_agent(self, agent_id: str):
+        """Remove an agent and its index entries from the registry"""
+        self._unindex_agent(agent_id)
+        self.agents.pop(agent_id, None)
+        self.agent_metadata.pop(agent_id, None)
+    
+    def _unindex_agent(self, agent_id: str):
+        search_text = self._search_text.pop(agent_id, None)
+        if search_text is None:
+            return
+        for capability in search_text[3]:
+            holders = self._capability_index.get(capability)
+            if holders is not None:
+                holders.pop(agent_id, None)
+                if not holders:
+                    del self._capability_index[capability]
+    
     async def discover_agents(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Discover agents based on a natural language query
@@ -133,26 +197,33 @@ class AgentManager:
         # Simple keyword-based matching for now
         # In production, this could use embedding-based similarity
         query_lower = query.lower()
-        scored_agents = []
+        query_words = query_lower.split()
+        scores: Dict[str, int] = {}
         
-        for agent_id, metadata in self.agent_metadata.items():
+        for agent_id, (name, description, agent_type, _) in self._search_text.items():
             score = 0
             
             # Check name and description
-            if query_lower in metadata["name"].lower():
+            if query_lower in name:
                 score += 10
-            if query_lower in metadata["description"].lower():
+            if query_lower in description:
                 score += 5
             
-            # Check capabilities
-            for capability in metadata["capabilities"]:
-                if any(word in capability.lower() for word in query_lower.split()):
-                    score += 3
-            
             # Check agent type
-            if query_lower in metadata["agent_type"].lower():
+            if query_lower in agent_type:
                 score += 2
             
+            scores[agent_id] = score
+        
+        # Check capabilities, once per distinct capability
+        for capability, holders in self._capability_index.items():
+            if any(word in capability for word in query_words):
+                for agent_id, count in holders.items():
+                    scores[agent_id] = scores.get(agent_id, 0) + 3 * count
+        
+        scored_agents = []
+        for agent_id, metadata in self.agent_metadata.items():
+            score = scores.get(agent_id, 0)
             if score > 0:
                 agent_info = dict(metadata)
                 agent_info["id"] = agent_id
@@ -163,22 +234,31 @@ class AgentManager:
         scored_agents.sort(key=lambda x: x["relevance_score"], reverse=True)
         return scored_agents[:limit]
     
-    def list_agents(self, agent_type: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List all registered agents with optional filtering"""
-        agents = []
+    def iter_agents(
+        self,
+        agent_type: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over (agent_id, metadata) pairs with optional filtering
         
+        Yields the registry's own metadata dicts without copying them, so
+        callers must treat them as read-only; use list_agents for copies.
+        """
         for agent_id, metadata in self.agent_metadata.items():
             # Apply filters
             if agent_type and metadata["agent_type"] != agent_type:
                 continue
             if status and metadata["status"] != status:
                 continue
-            
-            agent_info = dict(metadata)
-            agent_info["id"] = agent_id
-            agents.append(agent_info)
-        
-        return agents
+            yield agent_id, metadata
+    
+    def list_agents(self, agent_type: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List all registered agents with optional filtering"""
+        return [
+            {**metadata, "id": agent_id}
+            for agent_id, metadata in self.iter_agents(agent_type, status)
+        ]
     
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """Get an agent instance by ID"""
@@ -203,8 +283,7 @@ class AgentManager:
             
             # Remove old instance
             await agent.cleanup()
-            del self.agents[agent_id]
-            del self.agent_metadata[agent_id]
+            self._forget_agent(agent_id)
             
             # Try to reload from file
             # This is a simplified approach - in production you'd want more robust reloading
@@ -220,21 +299,7 @@ class AgentManager:
         """Manually register an agent instance"""
         try:
             await agent.initialize()
-            
-            self.agents[agent.id] = agent
-            self.agent_metadata[agent.id] = {
-                "name": agent.name,
-                "description": agent.description,
-                "agent_type": agent.agent_type,
-                "capabilities": agent.capabilities,
-                "model_provider": agent.model_provider,
-                "model_name": agent.model_name,
-                "status": "active",
-                "supports_streaming": agent.supports_streaming,
-                "supports_multimodal": agent.supports_multimodal,
-                "created_at": datetime.now(),
-                "updated_at": datetime.now(),
-            }
+            self._record_agent(agent)
             
             logger.info(f"Registered agent: {agent.id}")
             
@@ -248,8 +313,7 @@ class AgentManager:
             if agent_id in self.agents:
                 agent = self.agents[agent_id]
                 await agent.cleanup()
-                del self.agents[agent_id]
-                del self.agent_metadata[agent_id]
+                self._forget_agent(agent_id)
                 logger.info(f"Unregistered agent: {agent_id}")
                 return True
             return False
@@ -269,5 +333,7 @@ class AgentManager:
         
         self.agents.clear()
         self.agent_metadata.clear()
+        self._capability_index.clear()
+        self._search_text.clear()
         
         logger.info("Agent Registry cleanup complete")
\ No newline at end of file
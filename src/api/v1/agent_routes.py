@@ -108,29 +108,29 @@ async def get_agent_stats(
     ```
     """
     try:
-        agents = agent_registry.list_agents()
-        
-        # Calculate statistics
-        total_agents = len(agents)
-        active_agents = len([a for a in agents if a.get("status") == "active"])
-        
-        # Group by agent type
+        # Calculate statistics in a single pass over the registry, without
+        # copying each agent's metadata
+        total_agents = 0
+        active_agents = 0
         agent_types = {}
-        for agent in agents:
+        model_providers = {}
+        capabilities_stats = {}
+        
+        for _, agent in agent_registry.iter_agents():
+            total_agents += 1
+            if agent.get("status") == "active":
+                active_agents += 1
+            
+            # Group by agent type
             agent_type = agent.get("agent_type", "unknown")
             agent_types[agent_type] = agent_types.get(agent_type, 0) + 1
-        
-        # Group by model provider
-        model_providers = {}
-        for agent in agents:
+            
+            # Group by model provider
             provider = agent.get("model_provider", "unknown")
             model_providers[provider] = model_providers.get(provider, 0) + 1
-        
-        # Count capabilities occurrence
-        capabilities_stats = {}
-        for agent in agents:
-            capabilities = agent.get("capabilities", [])
-            for capability in capabilities:
+            
+            # Count capabilities occurrence
+            for capability in agent.get("capabilities", []):
                 capabilities_stats[capability] = capabilities_stats.get(capability, 0) + 1
         
         return AgentStatsResponse(
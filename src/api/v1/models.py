@@ -18,9 +18,8 @@ router = APIRouter()
 
 
 def get_model_manager(request: Request) -> ModelManager:
-    """Get model manager from app state"""
-    # For now, create a new instance - in production this should be injected
-    return ModelManager()
+    """Get the shared model manager (keeps provider clients and caches warm)"""
+    return ModelManager.instance()
 
 
 @router.get("/list", response_model=ModelListResponse)
@@ -4,7 +4,7 @@ Pydantic schemas for API requests and responses
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 
 
 class AgentInfo(BaseModel):
@@ -155,6 +155,11 @@ class ModelTestResponse(BaseModel):
     response: Optional[str] = Field(default=None, description="Model response")
     error: Optional[str] = Field(default=None, description="Error message if failed")
     latency: float = Field(..., description="Response latency in seconds")
+    
+    @field_serializer("latency")
+    def _round_latency(self, latency: float) -> float:
+        # Kept at full precision internally; rounded only in API output
+        return round(latency, 3)
 
 
 # Health check schemas
@@ -3,7 +3,7 @@ Application settings and configuration management
 """
 import os
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -134,6 +134,43 @@ class Settings(BaseSettings):
     )
     ollama_timeout: int = Field(default=60, description="Ollama timeout in seconds")
     
+    # Outbound request concurrency per provider
+    openai_max_concurrency: int = Field(default=64, description="Max concurrent OpenAI requests")
+    anthropic_max_concurrency: int = Field(default=32, description="Max concurrent Anthropic requests")
+    ollama_max_concurrency: int = Field(
+        default=4,
+        description="Max concurrent Ollama requests (match the server's OLLAMA_NUM_PARALLEL)"
+    )
+    
+    # Ollama micro-batching (needs a provider with generate_text_batch)
+    ollama_batch_window_ms: float = Field(
+        default=0.0,
+        description="Collect Ollama requests for this long and send them as one batch (0 disables)"
+    )
+    ollama_max_batch_size: int = Field(default=16, description="Max requests per Ollama batch")
+    
+    # Provider circuit breaker
+    provider_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive provider failures before calls are short-circuited"
+    )
+    provider_cooldown: float = Field(
+        default=30.0,
+        description="Seconds a failing provider is skipped before a trial call"
+    )
+    
+    # Model aliases for failover, e.g. {"chat": ["openai/gpt-4o-mini", "ollama/llama3.2:1b"]}
+    model_aliases: Dict[str, List[str]] = Field(
+        default_factory=dict,
+        description="Alias -> ordered provider/model candidates for failover"
+    )
+    
+    # Model listing cache
+    models_cache_ttl: float = Field(
+        default=300.0,
+        description="Seconds to cache provider model listings and model info"
+    )
+    
     # Hugging Face
     hf_token: Optional[str] = Field(default=None, description="Hugging Face token")
     hf_cache_dir: str = Field(
@@ -47,6 +47,19 @@ class AgentExecutionException(AgentSystemException):
         )
 
 
+class WorkflowNodeException(AgentSystemException):
+    """Exception raised when a workflow node fails, ending the workflow run"""
+    
+    def __init__(self, node_name: str, error: str, details: Optional[Dict[str, Any]] = None):
+        message = f"Workflow node '{node_name}' failed: {error}"
+        self.node_name = node_name
+        super().__init__(
+            message=message,
+            details=details,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 class ModelProviderException(AgentSystemException):
     """Exception raised when model provider fails"""
     
@@ -59,6 +72,19 @@ class ModelProviderException(AgentSystemException):
         )
 
 
+class ProviderUnavailableException(ModelProviderException):
+    """Exception raised when a provider's circuit breaker is open"""
+    
+    def __init__(self, provider: str, retry_after: float, details: Optional[Dict[str, Any]] = None):
+        self.provider = provider
+        self.retry_after = retry_after
+        super().__init__(
+            provider=provider,
+            error=f"temporarily unavailable after repeated failures, retry in {retry_after:.1f}s",
+            details=details,
+        )
+
+
 class ValidationException(AgentSystemException):
     """Exception raised for validation errors"""
     
@@ -1,6 +1,7 @@
 """
 Main FastAPI application entry point
 """
+import asyncio
 import os
 from contextlib import asynccontextmanager
 from typing import Any, Dict
@@ -21,7 +22,10 @@ from src.agents.registry.manager import AgentManager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
-    # Startup
+    # Startup. Logging is configured here rather than in create_app so that
+    # merely importing the app (e.g. from tests) leaves the global loguru
+    # handlers alone and creates no log files. Text format avoids JSON issues.
+    setup_logging(get_settings().log_level, "text")
     logger.info("Starting Multi-Agent System...")
     
     # Initialize observability first
@@ -53,13 +57,13 @@ async def lifespan(app: FastAPI):
         logger.warning(f"MCP system initialization failed (continuing without): {e}")
     
     # Initialize agent registry
-    agent_registry = AgentManager()
+    agent_registry = AgentManager.instance()
     await agent_registry.initialize()
     app.state.agent_registry = agent_registry
     
     # Load initial agents
     await agent_registry.discover_and_load_agents()
-    logger.info(f"✓ Loaded {len(agent_registry.list_agents())} agents")
+    logger.info(f"✓ Loaded {len(agent_registry.agents)} agents")
     
     # Health check for external services
     await _check_external_services()
@@ -76,6 +80,10 @@ async def lifespan(app: FastAPI):
     try:
         if hasattr(app.state, 'mcp_manager'):
             await app.state.mcp_manager.cleanup()
+        from src.services.model_manager import ModelManager
+        await ModelManager.close_instance()
+        from src.tools.base_tools import close_shared_clients
+        await close_shared_clients()
         logger.info("✓ Cleanup complete")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
@@ -85,27 +93,12 @@ async def _check_external_services():
     """Check connectivity to external services"""
     settings = get_settings()
     
-    # Check Redis connection
-    try:
-        import redis.asyncio as redis
-        redis_client = redis.from_url(settings.redis_url)
-        await redis_client.ping()
-        logger.info("✓ Redis connection healthy")
-        await redis_client.close()
-    except Exception as e:
-        logger.warning(f"⚠️ Redis connection failed: {e}")
-    
-    # Check Ollama connection
-    try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{settings.ollama_base_url}/api/tags", timeout=5.0)
-            if response.status_code == 200:
-                logger.info("✓ Ollama connection healthy")
-            else:
-                logger.warning(f"⚠️ Ollama returned status {response.status_code}")
-    except Exception as e:
-        logger.warning(f"⚠️ Ollama connection failed: {e}")
+    # The probes are independent, so startup waits for the slowest one
+    # rather than for their sum
+    await asyncio.gather(
+        _check_redis(settings.redis_url),
+        _check_ollama(settings.ollama_base_url)
+    )
     
     # Check model providers
     if settings.openai_api_key:
@@ -119,13 +112,38 @@ async def _check_external_services():
         logger.warning("⚠️ Anthropic API key not configured")
 
 
+async def _check_redis(redis_url: str):
+    """Log whether Redis answers a ping"""
+    try:
+        import redis.asyncio as redis
+        redis_client = redis.from_url(redis_url)
+        await redis_client.ping()
+        logger.info("✓ Redis connection healthy")
+        await redis_client.close()
+    except Exception as e:
+        logger.warning(f"⚠️ Redis connection failed: {e}")
+
+
+async def _check_ollama(ollama_base_url: str):
+    """Log whether Ollama answers its tags endpoint"""
+    # Use the model manager's pooled client, so the connection is kept
+    # alive for the Ollama provider afterwards
+    try:
+        from src.services.model_manager import ModelManager
+        client = ModelManager.instance().http_client
+        response = await client.get(f"{ollama_base_url}/api/tags", timeout=5.0)
+        if response.status_code == 200:
+            logger.info("✓ Ollama connection healthy")
+        else:
+            logger.warning(f"⚠️ Ollama returned status {response.status_code}")
+    except Exception as e:
+        logger.warning(f"⚠️ Ollama connection failed: {e}")
+
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
     settings = get_settings()
     
-    # Setup logging (force text format to avoid JSON issues)
-    setup_logging(settings.log_level, "text")
-    
     app = FastAPI(
         title=settings.api_title,
         description="A comprehensive multi-agent system with LLM integration",
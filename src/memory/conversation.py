@@ -94,6 +94,11 @@ class BaseMemory(ABC):
         """Add a message to memory"""
         pass
     
+    async def add_messages(self, messages: List[Tuple]):
+        """Add several (role, content[, metadata]) messages to memory"""
+        for role, content, *rest in messages:
+            await self.add_message(role, content, rest[0] if rest else None)
+    
     @abstractmethod
     async def get_conversation_history(self, limit: Optional[int] = None) -> List[BaseMessage]:
         """Get conversation history"""
@@ -147,6 +152,21 @@ class ConversationMemory(BaseMemory):
     
     async def add_message(self, role: str, content: str, metadata: Optional[Dict] = None):
         """Add a message to conversation memory"""
+        self._append_message(role, content, metadata)
+        
+        # Auto-save if configured
+        if self.config.persistence_path:
+            await self.save_to_storage()
+    
+    async def add_messages(self, messages: List[Tuple]):
+        """Add several (role, content[, metadata]) messages with a single save"""
+        for role, content, *rest in messages:
+            self._append_message(role, content, rest[0] if rest else None)
+        
+        if messages and self.config.persistence_path:
+            await self.save_to_storage()
+    
+    def _append_message(self, role: str, content: str, metadata: Optional[Dict]):
         message_data = {
             "id": str(uuid4()),
             "role": role,
@@ -163,10 +183,6 @@ class ConversationMemory(BaseMemory):
             self.langchain_memory.chat_memory.add_user_message(content)
         elif role == "assistant":
             self.langchain_memory.chat_memory.add_ai_message(content)
-        
-        # Auto-save if configured
-        if self.config.persistence_path:
-            await self.save_to_storage()
     
     async def get_conversation_history(self, limit: Optional[int] = None) -> List[BaseMessage]:
         """Get conversation history as LangChain messages"""
@@ -473,7 +489,7 @@ class HybridMemory:
     async def add_message(self, role: str, content: str, metadata: Optional[Dict] = None):
         """Add message to both conversation and vector memory"""
         # Add to conversation memory
-        await self.conversation_memory.add_message(role, content, metadata)
+        writes = [self.conversation_memory.add_message(role, content, metadata)]
         
         # Add to vector memory (for semantic search)
         if content.strip():  # Only add non-empty content
@@ -483,10 +499,34 @@ class HybridMemory:
                 **(metadata or {})
             }
             
-            await self.vector_memory.add_documents([{
+            writes.append(self.vector_memory.add_documents([{
                 "content": content,
                 "metadata": doc_metadata
-            }])
+            }]))
+        
+        # The two stores are independent, so write them concurrently
+        await asyncio.gather(*writes)
+    
+    async def add_messages(self, messages: List[Tuple]):
+        """Add several (role, content[, metadata]) messages to both memories in bulk"""
+        writes = [self.conversation_memory.add_messages(messages)]
+        
+        documents = [
+            {
+                "content": content,
+                "metadata": {
+                    "role": role,
+                    "session_id": self.session_id,
+                    **((rest[0] if rest else None) or {})
+                }
+            }
+            for role, content, *rest in messages
+            if content.strip()
+        ]
+        if documents:
+            writes.append(self.vector_memory.add_documents(documents))
+        
+        await asyncio.gather(*writes)
     
     async def get_conversation_history(self, limit: Optional[int] = None) -> List[BaseMessage]:
         """Get conversation history"""
@@ -60,9 +60,11 @@ async def initialize_observability(
         environment=environment
     )
     
-    print(f"Observability initialized for project: {project_name}")
-    print(f"Environment: {environment}")
-    print(f"LangSmith: {'Enabled' if langsmith_api_key else 'Mock Mode'}")
+    print(
+        f"Observability initialized for project: {project_name}\n"
+        f"Environment: {environment}\n"
+        f"LangSmith: {'Enabled' if langsmith_api_key else 'Mock Mode'}"
+    )
     
     return {
         "status": "initialized",
@@ -26,14 +26,20 @@ Usage:
         trace.log_result(result)
     ```
 """
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, AsyncIterator, Optional, List, Mapping, Union
 from datetime import datetime, timezone
 import json
 import asyncio
+import atexit
+import itertools
+import queue
+import threading
 import time
 import uuid
+from collections import deque
+from types import MappingProxyType
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 
 try:
@@ -47,6 +53,28 @@ except ImportError:
     Run = None
     RunType = None
 
+# Run types are fixed at import time so the tracing hot path has no branch
+_AGENT_RUN_TYPE = "chain" if LANGSMITH_AVAILABLE else "agent"
+_TOOL_RUN_TYPE = "tool" if LANGSMITH_AVAILABLE else "function"
+
+# Trace IDs are a per-process random salt plus a counter; they only need to be
+# unique, not unpredictable, so no entropy is drawn per trace
+_TRACE_ID_SALT = uuid.uuid4().hex[:16]
+_TRACE_ID_COUNTER = itertools.count()
+
+# Shared read-only metadata for traces created without any
+_EMPTY_METADATA = MappingProxyType({})
+
+# Queued after pending events to stop the event worker
+_EVENT_STOP = object()
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Convert a datetime to UTC, treating naive values as already in UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
 
 class TraceLevel(Enum):
     """Trace level enumeration"""
@@ -67,10 +95,11 @@ class AgentTrace:
     status: str = "running"
     input_data: Optional[Dict[str, Any]] = None
     output_data: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Mapping[str, Any]] = None
     error: Optional[str] = None
     parent_trace_id: Optional[str] = None
     child_traces: Optional[List[str]] = None
+    langsmith_run_id: Optional[str] = None
 
 
 @dataclass
@@ -89,29 +118,75 @@ class ToolTrace:
     parent_trace_id: Optional[str] = None
 
 
+# Free-lists of finished trace objects. Traces are recycled once their context
+# manager exits, so callers must not hold on to a trace past its ``async with``.
+_TRACE_POOL_SIZE = 256
+_AGENT_TRACE_POOL: "deque[AgentTrace]" = deque(maxlen=_TRACE_POOL_SIZE)
+_TOOL_TRACE_POOL: "deque[ToolTrace]" = deque(maxlen=_TRACE_POOL_SIZE)
+_AGENT_TRACE_FIELDS = tuple(f.name for f in fields(AgentTrace))
+_TOOL_TRACE_FIELDS = tuple(f.name for f in fields(ToolTrace))
+
+
+def _acquire_agent_trace(**kwargs) -> AgentTrace:
+    """Take an AgentTrace from the pool (or allocate one) and initialize it"""
+    trace = _AGENT_TRACE_POOL.pop() if _AGENT_TRACE_POOL else AgentTrace.__new__(AgentTrace)
+    trace.__init__(**kwargs)
+    return trace
+
+
+def _acquire_tool_trace(**kwargs) -> ToolTrace:
+    """Take a ToolTrace from the pool (or allocate one) and initialize it"""
+    trace = _TOOL_TRACE_POOL.pop() if _TOOL_TRACE_POOL else ToolTrace.__new__(ToolTrace)
+    trace.__init__(**kwargs)
+    return trace
+
+
+def _release_trace(pool: deque, trace_fields: tuple, trace: Any) -> None:
+    """Drop all references held by a finished trace and return it to its pool"""
+    for name in trace_fields:
+        setattr(trace, name, None)
+    pool.append(trace)
+
+
 class MockLangSmithClient:
     """Mock client for when LangSmith is not available"""
     
+    # Number of runs retained before the oldest are evicted
+    MAX_RETAINED_RUNS = 10_000
+    
     def __init__(self, api_key: str = None):
-        self.traces = []
+        self._trace_index: Dict[str, Dict[str, Any]] = {}
+        self._trace_ring: "deque[str]" = deque(maxlen=self.MAX_RETAINED_RUNS)
         print("Using mock LangSmith client - install 'langsmith' package for full functionality")
     
+    @property
+    def traces(self) -> List[Dict[str, Any]]:
+        """Retained runs, oldest first"""
+        return list(self._trace_index.values())
+    
     def create_run(self, **kwargs) -> str:
         """Mock run creation"""
         run_id = str(uuid.uuid4())
-        self.traces.append({"id": run_id, **kwargs})
+        if len(self._trace_ring) == self._trace_ring.maxlen:
+            self._trace_index.pop(self._trace_ring[0], None)
+        self._trace_ring.append(run_id)
+        self._trace_index[run_id] = {
+            "id": run_id,
+            "start_time": datetime.now(timezone.utc),
+            **kwargs
+        }
         return run_id
     
     def update_run(self, run_id: str, **kwargs):
         """Mock run update"""
-        for trace in self.traces:
-            if trace["id"] == run_id:
-                trace.update(kwargs)
-                break
+        run = self._trace_index.get(run_id)
+        if run is not None:
+            run.update(kwargs)
     
     def end_run(self, run_id: str, **kwargs):
         """Mock run end"""
-        self.update_run(run_id, end_time=datetime.now(timezone.utc), **kwargs)
+        kwargs.setdefault("end_time", datetime.now(timezone.utc))
+        self.update_run(run_id, **kwargs)
 
 
 class LangSmithTracer:
@@ -151,10 +226,14 @@ class LangSmithTracer:
             "error_count": 0,
             "success_count": 0
         }
+        
+        # Custom events are formatted and printed off the event loop
+        self._event_queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._event_thread: Optional[threading.Thread] = None
     
     def generate_trace_id(self) -> str:
         """Generate unique trace ID"""
-        return str(uuid.uuid4())
+        return f"{_TRACE_ID_SALT}-{next(_TRACE_ID_COUNTER):016x}"
     
     @asynccontextmanager
     async def trace_agent(
@@ -185,27 +264,26 @@ class LangSmithTracer:
         start_time = datetime.now(timezone.utc)
         
         # Create trace object
-        trace = AgentTrace(
+        trace = _acquire_agent_trace(
             trace_id=trace_id,
             agent_name=agent_name,
             start_time=start_time,
             input_data=input_data,
-            metadata=metadata or {},
-            parent_trace_id=parent_trace_id,
-            child_traces=[]
+            metadata=MappingProxyType(metadata) if metadata else _EMPTY_METADATA,
+            parent_trace_id=parent_trace_id
         )
         
         # Create LangSmith run
         run_id = self.client.create_run(
             name=f"agent_{agent_name}",
-            run_type="chain" if LANGSMITH_AVAILABLE else "agent",
+            run_type=_AGENT_RUN_TYPE,
             inputs=input_data or {},
             project_name=self.project_name,
             tags=[agent_name, self.environment],
             extra=metadata or {}
         )
         
-        trace.metadata["langsmith_run_id"] = run_id
+        trace.langsmith_run_id = run_id
         self.active_traces[trace_id] = trace
         
         # Create trace context
@@ -238,8 +316,7 @@ class LangSmithTracer:
             trace.duration = (end_time - start_time).total_seconds()
             
             # Update metrics
-            self.metrics["total_agent_executions"] += 1
-            self._update_avg_duration("agent", trace.duration)
+            self._finalize_agent(trace.duration)
             
             # End LangSmith run
             self.client.end_run(
@@ -252,6 +329,8 @@ class LangSmithTracer:
             self.active_traces.pop(trace_id, None)
             
             print(f"Agent trace completed: {agent_name} ({trace.duration:.3f}s)")
+            
+            _release_trace(_AGENT_TRACE_POOL, _AGENT_TRACE_FIELDS, trace)
     
     @asynccontextmanager
     async def trace_tool(
@@ -274,7 +353,7 @@ class LangSmithTracer:
         start_time = datetime.now(timezone.utc)
         
         # Create tool trace
-        trace = ToolTrace(
+        trace = _acquire_tool_trace(
             trace_id=trace_id,
             tool_name=tool_name,
             server_name=server_name,
@@ -286,7 +365,7 @@ class LangSmithTracer:
         # Create LangSmith run
         run_id = self.client.create_run(
             name=f"tool_{tool_name}",
-            run_type="tool" if LANGSMITH_AVAILABLE else "function",
+            run_type=_TOOL_RUN_TYPE,
             inputs=parameters or {},
             project_name=self.project_name,
             tags=[tool_name, server_name, "mcp_tool"],
@@ -316,8 +395,7 @@ class LangSmithTracer:
             trace.duration = (end_time - start_time).total_seconds()
             
             # Update metrics
-            self.metrics["total_tool_executions"] += 1
-            self._update_avg_duration("tool", trace.duration)
+            self._finalize_tool(trace.duration)
             
             # End LangSmith run
             self.client.end_run(
@@ -327,27 +405,30 @@ class LangSmithTracer:
             )
             
             self.active_tool_traces.pop(trace_id, None)
+            
+            _release_trace(_TOOL_TRACE_POOL, _TOOL_TRACE_FIELDS, trace)
     
     def _get_langsmith_parent_id(self, parent_trace_id: Optional[str]) -> Optional[str]:
         """Get LangSmith run ID for parent trace"""
-        if not parent_trace_id:
+        if parent_trace_id is None:
             return None
         
-        if parent_trace_id in self.active_traces:
-            return self.active_traces[parent_trace_id].metadata.get("langsmith_run_id")
-        
-        return None
+        parent = self.active_traces.get(parent_trace_id)
+        return parent.langsmith_run_id if parent is not None else None
     
-    def _update_avg_duration(self, trace_type: str, duration: float):
-        """Update average duration metrics"""
-        if trace_type == "agent":
-            count = self.metrics["total_agent_executions"]
-            current_avg = self.metrics["avg_agent_duration"]
-            self.metrics["avg_agent_duration"] = (current_avg * (count - 1) + duration) / count
-        elif trace_type == "tool":
-            count = self.metrics["total_tool_executions"]
-            current_avg = self.metrics["avg_tool_duration"]
-            self.metrics["avg_tool_duration"] = (current_avg * (count - 1) + duration) / count
+    def _finalize_agent(self, duration: float):
+        """Count a finished agent execution and update its running average"""
+        metrics = self.metrics
+        count = metrics["total_agent_executions"] + 1
+        metrics["total_agent_executions"] = count
+        metrics["avg_agent_duration"] += (duration - metrics["avg_agent_duration"]) / count
+    
+    def _finalize_tool(self, duration: float):
+        """Count a finished tool execution and update its running average"""
+        metrics = self.metrics
+        count = metrics["total_tool_executions"] + 1
+        metrics["total_tool_executions"] = count
+        metrics["avg_tool_duration"] += (duration - metrics["avg_tool_duration"]) / count
     
     async def log_event(
         self,
@@ -356,16 +437,46 @@ class LangSmithTracer:
         level: TraceLevel = TraceLevel.INFO,
         trace_id: Optional[str] = None
     ):
-        """Log a custom event"""
-        event_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "event_name": event_name,
-            "level": level.value,
-            "data": data,
-            "trace_id": trace_id
-        }
+        """
+        Log a custom event (serialization happens on a background thread)
         
-        print(f"Event [{level.value.upper()}]: {event_name} - {json.dumps(data, indent=2)}")
+        ``data`` is copied here, so later changes to its top-level entries
+        don't show up in the printed event.
+        """
+        self._event_queue.put_nowait((event_name, level.value, dict(data), time.time(), trace_id))
+        if self._event_thread is None or not self._event_thread.is_alive():
+            if self._event_thread is None:
+                # Print whatever is still queued when the process exits
+                atexit.register(self.flush_events)
+            self._event_thread = threading.Thread(
+                target=self._event_worker, name="langsmith-events", daemon=True
+            )
+            self._event_thread.start()
+    
+    def flush_events(self, timeout: float = 5.0):
+        """Print all queued events and stop the event worker"""
+        thread = self._event_thread
+        if thread is None or not thread.is_alive():
+            return
+        self._event_queue.put_nowait(_EVENT_STOP)
+        thread.join(timeout)
+    
+    def _event_worker(self):
+        """Format and print queued events in submission order"""
+        while True:
+            item = self._event_queue.get()
+            if item is _EVENT_STOP:
+                return
+            event_name, level, data, timestamp, trace_id = item
+            try:
+                try:
+                    payload = json.dumps(data, indent=2, default=str)
+                except (TypeError, ValueError):
+                    payload = repr(data)
+                print(f"Event [{level.upper()}]: {event_name} - {payload}")
+            except Exception as e:
+                # One bad event (e.g. a failing __repr__) must not stop the worker
+                print(f"Event [{level.upper()}]: {event_name} - <unprintable: {e!r}>")
     
     async def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
@@ -376,21 +487,72 @@ class LangSmithTracer:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
-    async def export_traces(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
-        """Export traces for a given time period"""
-        # In a real implementation, this would query LangSmith API
-        # For now, return mock data structure
-        return [
-            {
-                "trace_id": "example-trace-id",
-                "agent_name": "research_agent",
-                "start_time": start_date.isoformat(),
-                "end_time": end_date.isoformat(),
-                "duration": 2.5,
-                "status": "completed",
-                "tools_used": ["web_search", "url_extract"]
-            }
-        ]
+    async def export_traces(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        page_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream traces started within a given time period
+        
+        Runs are fetched ``page_size`` at a time, so memory stays bounded
+        regardless of the size of the window. Naive bounds are taken to be
+        in UTC.
+        
+        Usage:
+            ```python
+            async for trace in tracer.export_traces(start, end):
+                print(trace["agent_name"], trace["duration"])
+            ```
+        """
+        start_date = _as_utc(start_date)
+        end_date = _as_utc(end_date)
+        
+        if isinstance(self.client, MockLangSmithClient):
+            for run in list(self.client._trace_index.values()):
+                if start_date <= _as_utc(run["start_time"]) <= end_date:
+                    yield self._export_run(run)
+            return
+        
+        # Both bounds are applied by the server, so runs outside the window
+        # are never fetched
+        runs = iter(self.client.list_runs(
+            project_name=self.project_name,
+            start_time=start_date,
+            filter=f'lte(start_time, "{end_date.isoformat()}")'
+        ))
+        while True:
+            page = await asyncio.to_thread(lambda: list(itertools.islice(runs, page_size)))
+            for run in page:
+                run_start = _as_utc(run.start_time)
+                if start_date <= run_start <= end_date:
+                    yield self._export_run({
+                        "id": run.id,
+                        "name": run.name,
+                        "start_time": run_start,
+                        "end_time": run.end_time and _as_utc(run.end_time),
+                        "status": run.status,
+                        "error": run.error,
+                        "tags": run.tags
+                    })
+            if len(page) < page_size:
+                break
+    
+    @staticmethod
+    def _export_run(run: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a stored run into the export record format"""
+        start_time = run.get("start_time")
+        end_time = run.get("end_time")
+        return {
+            "trace_id": str(run["id"]),
+            "agent_name": run.get("name"),
+            "start_time": start_time.isoformat() if start_time else None,
+            "end_time": end_time.isoformat() if end_time else None,
+            "duration": (end_time - start_time).total_seconds() if start_time and end_time else None,
+            "status": run.get("status") or ("error" if run.get("error") else "completed"),
+            "tags": run.get("tags") or []
+        }
 
 
 class AgentTraceContext:
@@ -401,10 +563,8 @@ class AgentTraceContext:
         self.trace = trace
     
     def add_metadata(self, metadata: Dict[str, Any]):
-        """Add metadata to the trace"""
-        if self.trace.metadata is None:
-            self.trace.metadata = {}
-        self.trace.metadata.update(metadata)
+        """Add metadata to the trace (copy-on-write, the caller's dict is never mutated)"""
+        self.trace.metadata = {**(self.trace.metadata or {}), **metadata}
     
     def log_result(self, result: Any):
         """Log execution result"""
@@ -458,6 +618,14 @@ def initialize_tracer(
 ) -> LangSmithTracer:
     """Initialize the global LangSmith tracer"""
     global _langsmith_tracer
+    # Repeated initialization with the same settings (app startup after a
+    # setup run, reloads) keeps the existing client and collected traces
+    if _langsmith_tracer is not None and (
+        _langsmith_tracer.api_key,
+        _langsmith_tracer.project_name,
+        _langsmith_tracer.environment,
+    ) == (api_key, project_name, environment):
+        return _langsmith_tracer
     _langsmith_tracer = LangSmithTracer(
         api_key=api_key,
         project_name=project_name,
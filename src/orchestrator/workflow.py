@@ -31,19 +31,39 @@ Example Usage:
 """
 
 import asyncio
+import itertools
+import operator
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable, TypedDict, Annotated
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple, TypedDict, Annotated
 from enum import Enum
+from types import MappingProxyType
 import json
 
-from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolExecutor
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Command
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from loguru import logger
 
 from src.agents.base.agent import BaseAgent
 from src.agents.registry.manager import AgentManager
+from src.core.exceptions import WorkflowNodeException
+
+try:
+    # Faster JSON encoder - install with: pip install orjson
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _serialize_input(data: Any) -> str:
+    """Serialize workflow input to JSON text for the seeding message"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, default=str)
 
 
 class WorkflowStatus(str, Enum):
@@ -55,17 +75,32 @@ class WorkflowStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """State reducer that merges dict updates into the existing value"""
+    return {**left, **right}
+
+
+# Raw status strings stored in workflow state. WorkflowStatus is a str Enum, so
+# these compare equal to the members, but plain str comparison skips Enum.__eq__
+_RUNNING = WorkflowStatus.RUNNING.value
+_COMPLETED = WorkflowStatus.COMPLETED.value
+_FAILED = WorkflowStatus.FAILED.value
+
+
 class WorkflowState(TypedDict):
     """
     Base state structure for workflows
     
-    This can be extended by specific workflows to include additional state fields
+    This can be extended by specific workflows to include additional state fields.
+    Nodes return only the fields they change; ``steps_completed`` and
+    ``agent_outputs`` are accumulated by reducers so updates from parallel
+    branches merge instead of overwriting each other.
     """
     # Core workflow state
     workflow_id: str
-    status: WorkflowStatus
+    status: str  # WorkflowStatus value
     current_step: str
-    steps_completed: List[str]
+    steps_completed: Annotated[List[str], operator.add]
     
     # Input/Output
     initial_input: Dict[str, Any]
@@ -74,7 +109,7 @@ class WorkflowState(TypedDict):
     
     # Agent coordination
     active_agents: List[str]
-    agent_outputs: Dict[str, Any]
+    agent_outputs: Annotated[Dict[str, Any], merge_dicts]
     
     # Messages and communication
     messages: List[BaseMessage]
@@ -86,6 +121,74 @@ class WorkflowState(TypedDict):
     error_message: Optional[str]
 
 
+# Reducers of the WorkflowState fields that accumulate across nodes
+_STATE_REDUCERS: Dict[str, Callable[[Any, Any], Any]] = {
+    "steps_completed": operator.add,
+    "agent_outputs": merge_dicts
+}
+
+
+def _apply_update(state: WorkflowState, update: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the state as it will be after ``update``, applying field reducers"""
+    view = {**state, **update}
+    for field, reducer in _STATE_REDUCERS.items():
+        if field in update and field in state:
+            view[field] = reducer(state[field], update[field])
+    return view
+
+
+# Sentinel for memoized condition lookups
+_MISSING = object()
+
+# Characters of final output kept in each execution history entry
+_HISTORY_OUTPUT_PREVIEW = 512
+
+# Compiled graphs keyed by workflow shape, shared by structurally identical
+# workflows. Executors find the running workflow in the config, so a shared
+# graph never holds on to the workflow that compiled it.
+_COMPILED_GRAPH_CACHE: "OrderedDict[Tuple, Tuple[StateGraph, Any]]" = OrderedDict()
+_COMPILED_GRAPH_CACHE_SIZE = 128
+
+
+async def _extract_document_content(state: WorkflowState) -> Dict[str, Any]:
+    """
+    Extract content from document
+    
+    Defined at module level so every document processing workflow shares
+    the same function and therefore the same compiled graph.
+    """
+    # This would integrate with actual document processing tools
+    doc_input = state.get("current_input", {})
+    extracted_content = f"Extracted content from: {doc_input}"
+    
+    return {
+        "current_input": {
+            "message": f"Please analyze this content: {extracted_content}",
+            "content": extracted_content
+        }
+    }
+
+
+def _route_multimodal_input(state: WorkflowState) -> str:
+    """
+    Route to different processors based on input type
+    
+    Module level for the same reason as _extract_document_content.
+    """
+    current_input = state.get("current_input", {})
+    
+    if "image" in current_input or "file_path" in current_input:
+        return "vision_processor"
+    else:
+        return "text_processor"
+
+
+def _has_tools(agent: BaseAgent, tools: List[BaseTool]) -> bool:
+    """Whether every tool in ``tools`` is currently installed on ``agent``"""
+    installed = {id(tool) for tool in agent.tools}
+    return all(id(tool) in installed for tool in tools)
+
+
 class WorkflowNode:
     """
     Represents a single node/step in a workflow
@@ -99,7 +202,8 @@ class WorkflowNode:
         function: Optional[Callable] = None,
         tools: Optional[List[BaseTool]] = None,
         condition: Optional[Callable] = None,
-        timeout: int = 300
+        timeout: int = 300,
+        condition_keys: Optional[List[str]] = None
     ):
         self.name = name
         self.agent_type = agent_type
@@ -108,6 +212,16 @@ class WorkflowNode:
         self.tools = tools or []
         self.condition = condition
         self.timeout = timeout
+        # State fields the condition reads; when given, results are memoized on them
+        self.condition_keys = tuple(condition_keys) if condition_keys else None
+        
+        # Set by compile(): "message" when every upstream node is an agent node,
+        # so current_input is known to carry a "message" key
+        self._input_shape = "raw"
+        
+        # Resolved once so execution does not re-inspect the callables
+        self._is_async = asyncio.iscoroutinefunction(function) if function else False
+        self._condition_is_async = asyncio.iscoroutinefunction(condition) if condition else False
 
 
 class MultiAgentWorkflow:
@@ -120,20 +234,32 @@ class MultiAgentWorkflow:
         workflow_id: str,
         name: str,
         description: str = "",
-        agent_manager: Optional[AgentManager] = None
+        agent_manager: Optional[AgentManager] = None,
+        agent_cache_ttl: float = 300.0,
+        history_limit: int = 1000
     ):
         self.workflow_id = workflow_id
         self.name = name
         self.description = description
-        self.agent_manager = agent_manager or AgentManager()
+        self.agent_manager = agent_manager or AgentManager.instance()
         
         # Graph components
         self.graph: Optional[StateGraph] = None
         self.nodes: Dict[str, WorkflowNode] = {}
+        self.parallel_groups: Dict[str, Dict[str, Any]] = {}
+        self.edges: List[Tuple[str, str]] = []
+        self.conditional_edges: List[Tuple[str, Callable, Dict[str, str]]] = []
+        self.command_routes: Dict[str, Tuple[Callable, Optional[Dict[str, str]]]] = {}
         self.compiled_graph = None
+        self._state_template: Dict[str, Any] = {}
+        
+        # Agent pools keyed by ("id", agent_id) or ("type", agent_type)
+        self.agent_cache_ttl = agent_cache_ttl
+        self._agent_cache: Dict[Tuple[str, str], Tuple[Iterator[BaseAgent], float]] = {}
+        self._agents_prewarmed = False
         
         # Execution tracking
-        self.execution_history: List[Dict[str, Any]] = []
+        self.execution_history: "deque[Dict[str, Any]]" = deque(maxlen=history_limit)
         
         logger.info(f"Created workflow: {self.workflow_id} ({self.name})")
     
@@ -143,6 +269,96 @@ class MultiAgentWorkflow:
         logger.info(f"Added node '{node.name}' to workflow {self.workflow_id}")
         return self
     
+    def add_parallel_nodes(self, sources: List[str], join: str) -> 'MultiAgentWorkflow':
+        """
+        Run independent nodes concurrently and continue at ``join``
+        
+        The source nodes run as a single graph step. Edges into any of the
+        source nodes lead to that step, so every source runs whichever one is
+        targeted; the group always continues at ``join``, which receives the
+        combined responses. Their agent outputs and completed steps are merged.
+        """
+        missing = [name for name in sources if name not in self.nodes]
+        if missing:
+            raise ValueError(f"Unknown nodes for parallel group: {missing}")
+        if len(sources) < 2:
+            raise ValueError("A parallel group needs at least two nodes")
+        
+        group_name = "+".join(sources)
+        self.parallel_groups[group_name] = {"sources": list(sources), "join": join}
+        logger.info(f"Added parallel group '{group_name}' -> {join} to workflow {self.workflow_id}")
+        return self
+    
+    async def _get_agent_pool(self, node: WorkflowNode) -> Optional[Iterator[BaseAgent]]:
+        """
+        Get the round-robin pool of agents that can serve a node
+        
+        Pools are cached per workflow for ``agent_cache_ttl`` seconds, so the
+        registry is only consulted when a pool is missing or stale.
+        """
+        if node.agent_id:
+            key = ("id", node.agent_id)
+        elif node.agent_type:
+            key = ("type", node.agent_type)
+        else:
+            raise ValueError(f"Node {node.name} requires either agent_id or agent_type")
+        
+        now = time.monotonic()
+        cached = self._agent_cache.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        
+        if node.agent_id:
+            agent = self.agent_manager.get_agent(node.agent_id)
+            agents = [agent] if agent else []
+        else:
+            discovered = await self.agent_manager.discover_agents(node.agent_type)
+            if not discovered:
+                raise ValueError(f"No agents found for type: {node.agent_type}")
+            # Round-robin only over agents of the requested type; without
+            # any, over the hits tied for the best relevance score, so weak
+            # text matches never share the load
+            agents = [
+                agent for agent in (self.agent_manager.get_agent(info["id"]) for info in discovered)
+                if agent and agent.agent_type == node.agent_type
+            ]
+            if not agents:
+                top_score = max(info.get("relevance_score", 0) for info in discovered)
+                agents = [
+                    agent for agent in (
+                        self.agent_manager.get_agent(info["id"]) for info in discovered
+                        if info.get("relevance_score", 0) == top_score
+                    )
+                    if agent
+                ]
+        
+        if not agents:
+            return None
+        
+        pool = itertools.cycle(agents)
+        self._agent_cache[key] = (pool, now + self.agent_cache_ttl)
+        return pool
+    
+    async def _resolve_agent(self, node: WorkflowNode) -> Optional[BaseAgent]:
+        """Get the next agent for a node from its pool"""
+        pool = await self._get_agent_pool(node)
+        return next(pool) if pool is not None else None
+    
+    async def _prewarm_agents(self):
+        """Resolve agent pools for every agent node ahead of the first execution"""
+        agent_nodes = [node for node in self.nodes.values() if node.agent_id or node.agent_type]
+        # Lookup failures surface when the node itself runs
+        await asyncio.gather(
+            *(self._get_agent_pool(node) for node in agent_nodes),
+            return_exceptions=True
+        )
+        self._agents_prewarmed = True
+    
+    def invalidate_agent_cache(self):
+        """Drop cached agent pools, e.g. after agents are reloaded"""
+        self._agent_cache.clear()
+        self._agents_prewarmed = False
+    
     async def _execute_agent_node(
         self, 
         state: WorkflowState, 
@@ -150,17 +366,7 @@ class MultiAgentWorkflow:
     ) -> Dict[str, Any]:
         """Execute a node that uses an agent"""
         try:
-            # Get or create agent
-            if node.agent_id:
-                agent = await self.agent_manager.get_agent(node.agent_id)
-            elif node.agent_type:
-                agents = await self.agent_manager.discover_agents(node.agent_type)
-                if not agents:
-                    raise ValueError(f"No agents found for type: {node.agent_type}")
-                agent = agents[0]  # Use first available agent
-            else:
-                raise ValueError(f"Node {node.name} requires either agent_id or agent_type")
-            
+            agent = await self._resolve_agent(node)
             if not agent:
                 raise ValueError(f"Agent not found for node {node.name}")
             
@@ -168,15 +374,20 @@ class MultiAgentWorkflow:
             agent_input = state.get("current_input", {})
             session_id = f"{state['workflow_id']}_{node.name}"
             
-            # Add tools to agent if specified
-            if node.tools:
-                for tool in node.tools:
-                    agent.add_tool(tool)
+            # Install node tools only when the agent doesn't already hold
+            # them; agents are shared, so check the agent itself rather than
+            # remembering what this workflow installed
+            if node.tools and not _has_tools(agent, node.tools):
+                agent.set_tools(node.tools)
             
             # Execute agent
-            logger.info(f"Executing agent {agent.id} for node {node.name}")
+            logger.opt(lazy=True).debug(
+                "Executing agent {} for node {}", lambda: agent.id, lambda: node.name
+            )
             
-            if isinstance(agent_input, dict) and "message" in agent_input:
+            if node._input_shape == "message":
+                message = agent_input["message"]
+            elif isinstance(agent_input, dict) and "message" in agent_input:
                 message = agent_input["message"]
             else:
                 message = str(agent_input)
@@ -187,118 +398,405 @@ class MultiAgentWorkflow:
                 context=agent_input
             )
             
-            # Update state
-            state["agent_outputs"][node.name] = {
-                "agent_id": agent.id,
-                "response": response.content,
-                "metadata": response.metadata
-            }
-            
-            state["current_input"] = {
-                "message": response.content,
-                **response.metadata
+            return {
+                "agent_outputs": {
+                    node.name: {
+                        "agent_id": agent.id,
+                        "response": response.content,
+                        "metadata": response.metadata
+                    }
+                },
+                "current_input": {
+                    "message": response.content,
+                    **response.metadata
+                }
             }
             
-            return state
-            
         except Exception as e:
             logger.error(f"Error executing agent node {node.name}: {str(e)}")
-            state["error_message"] = str(e)
-            state["status"] = WorkflowStatus.FAILED
-            return state
+            raise WorkflowNodeException(node.name, str(e)) from e
     
     async def _execute_function_node(
         self, 
         state: WorkflowState, 
         node: WorkflowNode
     ) -> Dict[str, Any]:
-        """Execute a node that uses a custom function"""
+        """
+        Execute a node that uses a custom function
+        
+        The function receives a read-only view of the current state and
+        returns only the fields it wants to change; any non-dict result
+        becomes ``current_input``. Entries echoed back unchanged from the
+        state are dropped so reducer fields are not applied twice.
+        """
         try:
             if not node.function:
                 raise ValueError(f"Node {node.name} requires a function")
             
-            logger.info(f"Executing function for node {node.name}")
+            logger.opt(lazy=True).debug("Executing function for node {}", lambda: node.name)
             
             # Execute function (handle both sync and async)
-            if asyncio.iscoroutinefunction(node.function):
-                result = await node.function(state)
+            view = MappingProxyType(state)
+            if node._is_async:
+                result = await node.function(view)
             else:
-                result = node.function(state)
+                result = node.function(view)
             
-            # Update state based on result
             if isinstance(result, dict):
-                state.update(result)
-            else:
-                state["current_input"] = {"result": result}
-            
-            return state
+                return {
+                    key: value for key, value in result.items()
+                    if value is not state.get(key, _MISSING)
+                }
+            return {"current_input": {"result": result}}
             
         except Exception as e:
             logger.error(f"Error executing function node {node.name}: {str(e)}")
-            state["error_message"] = str(e)
-            state["status"] = WorkflowStatus.FAILED
-            return state
+            raise WorkflowNodeException(node.name, str(e)) from e
     
     def _create_node_executor(self, node_name: str):
-        """Create an executor function for a specific node"""
+        """
+        Create an executor function for a specific node
         
-        async def execute_node(state: WorkflowState) -> WorkflowState:
-            node = self.nodes[node_name]
-            
-            # Check condition if specified
-            if node.condition and not node.condition(state):
-                logger.info(f"Skipping node {node_name} - condition not met")
-                return state
+        The execution method is resolved here, once per compile, so the
+        executor does no type dispatch per invocation. The workflow itself
+        is taken from ``config["configurable"]["workflow"]`` on every call,
+        which lets structurally identical workflows share the compiled graph
+        while keeping their own agent pools and node settings.
+        """
+        node = self.nodes[node_name]
+        if node.agent_type or node.agent_id:
+            run = MultiAgentWorkflow._execute_agent_node
+        elif node.function:
+            run = MultiAgentWorkflow._execute_function_node
+        else:
+            raise ValueError(f"Node {node_name} has no execution method defined")
+        condition = node.condition
+        
+        async def execute_node(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+            workflow = config["configurable"]["workflow"]
+            delta = await run(workflow, state, workflow.nodes[node_name])
             
-            # Update tracking
-            state["current_step"] = node_name
-            state["updated_at"] = datetime.now()
+            # Update tracking (updated_at is stamped once when the workflow ends);
+            # failures raise WorkflowNodeException, so reaching here means success
+            return {**delta, "current_step": node_name, "steps_completed": [node_name]}
+        
+        # Specialize on the condition so unconditional nodes never test for one
+        if condition is None:
+            return execute_node
+        
+        if node.condition_keys:
+            condition = self._memoize_condition(condition, node.condition_keys, node._condition_is_async)
+        
+        if node._condition_is_async:
+            async def execute_conditional_node(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+                if not await condition(state):
+                    logger.opt(lazy=True).debug("Skipping node {} - condition not met", lambda: node_name)
+                    return {}
+                return await execute_node(state, config)
+        else:
+            async def execute_conditional_node(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+                if not condition(state):
+                    logger.opt(lazy=True).debug("Skipping node {} - condition not met", lambda: node_name)
+                    return {}
+                return await execute_node(state, config)
+        
+        return execute_conditional_node
+    
+    @staticmethod
+    def _memoize_condition(
+        condition: Callable,
+        condition_keys: Tuple[str, ...],
+        is_async: bool,
+        maxsize: int = 128
+    ) -> Callable:
+        """
+        Memoize a condition on the values of the state fields it depends on
+        
+        States whose relevant values are unhashable bypass the cache.
+        """
+        results: "OrderedDict[Tuple, Any]" = OrderedDict()
+        
+        def lookup(state: WorkflowState) -> Tuple[Optional[Tuple], Any]:
+            key = tuple(state.get(field) for field in condition_keys)
+            try:
+                result = results.get(key, _MISSING)
+            except TypeError:
+                return None, _MISSING
+            if result is not _MISSING:
+                results.move_to_end(key)
+            return key, result
+        
+        def store(key: Tuple, result: Any):
+            results[key] = result
+            if len(results) > maxsize:
+                results.popitem(last=False)
+        
+        if is_async:
+            async def memoized_condition(state: WorkflowState) -> Any:
+                key, result = lookup(state)
+                if result is _MISSING:
+                    result = await condition(state)
+                    if key is not None:
+                        store(key, result)
+                return result
+        else:
+            def memoized_condition(state: WorkflowState) -> Any:
+                key, result = lookup(state)
+                if result is _MISSING:
+                    result = condition(state)
+                    if key is not None:
+                        store(key, result)
+                return result
+        
+        return memoized_condition
+    
+    def _with_command_route(
+        self,
+        executor: Callable,
+        route_func: Callable,
+        route_map: Optional[Dict[str, str]],
+        grouped_nodes: Dict[str, str]
+    ):
+        """Wrap a node executor so it returns its update and next node as one Command"""
+        
+        async def execute_and_route(state: WorkflowState, config: RunnableConfig) -> Command:
+            update = await executor(state, config)
+            target = route_func(_apply_update(state, update))
+            if route_map is not None:
+                target = route_map[target]
+            return Command(update=update, goto=grouped_nodes.get(target, target))
+        
+        return execute_and_route
+    
+    def _create_parallel_executor(self, node_names: List[str]):
+        """Create an executor that runs several nodes concurrently"""
+        executors = [self._create_node_executor(node_name) for node_name in node_names]
+        
+        async def execute_parallel(state: WorkflowState, config: RunnableConfig) -> Dict[str, Any]:
+            # Nodes only read the state and return deltas, so branches can share it
+            results = await asyncio.gather(
+                *(executor(state, config) for executor in executors),
+                return_exceptions=True
+            )
             
-            # Execute based on node type
-            if node.agent_type or node.agent_id:
-                result_state = await self._execute_agent_node(state, node)
-            elif node.function:
-                result_state = await self._execute_function_node(state, node)
-            else:
-                raise ValueError(f"Node {node_name} has no execution method defined")
+            # Let every branch finish, then fail the group on the first error
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
             
-            # Update completion tracking
-            if result_state.get("status") != WorkflowStatus.FAILED:
-                result_state["steps_completed"].append(node_name)
+            update: Dict[str, Any] = {
+                "current_step": "+".join(node_names),
+                "agent_outputs": {},
+                "steps_completed": []
+            }
+            branch_inputs = {}
+            for node_name, result in zip(node_names, results):
+                update["agent_outputs"].update(result.get("agent_outputs", {}))
+                update["steps_completed"].extend(result.get("steps_completed", []))
+                branch_inputs[node_name] = result.get("current_input", state.get("current_input"))
             
-            return result_state
+            update["current_input"] = {
+                "message": "\n\n".join(
+                    str(branch_input.get("message", "")) if isinstance(branch_input, dict) else str(branch_input)
+                    for branch_input in branch_inputs.values()
+                ),
+                "branches": branch_inputs
+            }
+            return update
+        
+        return execute_parallel
+    
+    def _graph_signature(self) -> Tuple:
+        """
+        Describe the workflow shape for compiled graph caching
+        
+        Callables and tools are identified by ``id()``; a cached graph keeps
+        the nodes that built it alive, so those ids cannot be reused while
+        the cache entry exists. The agent manager is not part of the shape
+        because executors reach it through the running workflow.
+        """
+        return (
+            tuple(
+                (
+                    node.name,
+                    node.agent_type,
+                    node.agent_id,
+                    id(node.function),
+                    id(node.condition),
+                    node.condition_keys,
+                    tuple(id(tool) for tool in node.tools),
+                    node.timeout
+                )
+                for node in self.nodes.values()
+            ),
+            tuple(
+                (group_name, tuple(group["sources"]), group["join"])
+                for group_name, group in self.parallel_groups.items()
+            ),
+            tuple(self.edges),
+            tuple(
+                (from_node, id(condition_func), tuple(sorted(condition_map.items())))
+                for from_node, condition_func, condition_map in self.conditional_edges
+            ),
+            tuple(
+                (from_node, id(route_func), tuple(sorted((route_map or {}).items())))
+                for from_node, (route_func, route_map) in self.command_routes.items()
+            )
+        )
+    
+    def _resolve_input_shapes(self, grouped_nodes: Dict[str, str], entry_node: Optional[str]):
+        """
+        Mark nodes whose input always comes from an unconditional agent node
+        
+        Agent nodes and parallel groups always emit ``{"message": ...}``, so
+        nodes fed only by them can read the message without type checks.
+        ``entry_node`` is the implicit entry point, which receives the raw
+        workflow input from START like explicit START edges do.
+        """
+        predecessors: Dict[str, List[str]] = {}
+        if entry_node is not None:
+            predecessors[entry_node] = [START]
+        
+        def add(from_node: str, to_node: str):
+            predecessors.setdefault(grouped_nodes.get(to_node, to_node), []).append(from_node)
         
-        return execute_node
+        for from_node, to_node in self.edges:
+            add(from_node, to_node)
+        for from_node, _, condition_map in self.conditional_edges:
+            for to_node in condition_map.values():
+                add(from_node, to_node)
+        for from_node, (_, route_map) in self.command_routes.items():
+            for to_node in (route_map or {}).values():
+                add(from_node, to_node)
+        for group_name, group in self.parallel_groups.items():
+            predecessors.setdefault(group["join"], []).append(group_name)
+        
+        def emits_message(node_name: str) -> bool:
+            if node_name in self.parallel_groups:
+                return True
+            node = self.nodes.get(node_name)
+            return bool(node and (node.agent_id or node.agent_type) and not node.condition)
+        
+        # Command routes without a map can reach any node, so no input is known
+        has_unmapped_route = any(route_map is None for _, route_map in self.command_routes.values())
+        
+        for node_name, node in self.nodes.items():
+            sources = predecessors.get(grouped_nodes.get(node_name, node_name))
+            node._input_shape = (
+                "message"
+                if sources and not has_unmapped_route and all(emits_message(source) for source in sources)
+                else "raw"
+            )
     
     def compile(self) -> 'MultiAgentWorkflow':
         """Compile the workflow into an executable graph"""
         if not self.nodes:
             raise ValueError("Cannot compile workflow with no nodes")
         
+        # Immutable part of the initial state, shared by every execution
+        self._state_template = {
+            "workflow_id": self.workflow_id,
+            "status": _RUNNING,
+            "current_step": "",
+            "final_output": None,
+            "execution_time": 0.0,
+            "error_message": None
+        }
+        
+        # Nodes that belong to a parallel group run inside the group's step
+        grouped_nodes = {
+            node_name: group_name
+            for group_name, group in self.parallel_groups.items()
+            for node_name in group["sources"]
+        }
+        
+        routed_in_group = [name for name in self.command_routes if name in grouped_nodes]
+        if routed_in_group:
+            raise ValueError(f"Nodes in a parallel group cannot route with commands: {routed_in_group}")
+        
+        # A group always continues at its join node
+        branching_in_group = [
+            from_node
+            for from_node in itertools.chain(
+                (from_node for from_node, _ in self.edges),
+                (from_node for from_node, _, _ in self.conditional_edges)
+            )
+            if from_node in grouped_nodes
+        ]
+        if branching_in_group:
+            raise ValueError(
+                f"Nodes in a parallel group continue at the group's join node: {branching_in_group}"
+            )
+        
+        # Entry point is the first node added unless the edges define one
+        has_entry = any(from_node == START for from_node, _ in self.edges) or any(
+            from_node == START for from_node, _, _ in self.conditional_edges
+        )
+        entry_node = None
+        if not has_entry:
+            first_node = next(iter(self.nodes.keys()))
+            entry_node = grouped_nodes.get(first_node, first_node)
+        
+        # Input shapes live on this workflow's nodes, so resolve them even
+        # when the compiled graph is shared
+        self._resolve_input_shapes(grouped_nodes, entry_node)
+        
+        signature = self._graph_signature()
+        cached = _COMPILED_GRAPH_CACHE.get(signature)
+        if cached is not None:
+            _COMPILED_GRAPH_CACHE.move_to_end(signature)
+            self.graph, self.compiled_graph = cached
+            logger.info(f"Reused compiled graph for workflow {self.workflow_id}")
+            return self
+        
         # Create state graph
         self.graph = StateGraph(WorkflowState)
         
         # Add nodes
         for node_name in self.nodes:
+            if node_name in grouped_nodes:
+                continue
             executor = self._create_node_executor(node_name)
-            self.graph.add_node(node_name, executor)
+            if node_name in self.command_routes:
+                route_func, route_map = self.command_routes[node_name]
+                self.graph.add_node(
+                    node_name,
+                    self._with_command_route(executor, route_func, route_map, grouped_nodes),
+                    destinations=tuple(
+                        {grouped_nodes.get(to_node, to_node) for to_node in route_map.values()}
+                    ) if route_map else None
+                )
+            else:
+                self.graph.add_node(node_name, executor)
+        
+        for group_name, group in self.parallel_groups.items():
+            self.graph.add_node(group_name, self._create_parallel_executor(group["sources"]))
+            self.graph.add_edge(group_name, group["join"])
+        
+        if entry_node is not None:
+            self.graph.set_entry_point(entry_node)
         
-        # Set entry point (first node added)
-        first_node = next(iter(self.nodes.keys()))
-        self.graph.set_entry_point(first_node)
+        # Add edges; edges into a grouped node lead to its group
+        for from_node, to_node in self.edges:
+            self.graph.add_edge(from_node, grouped_nodes.get(to_node, to_node))
+        for from_node, condition_func, condition_map in self.conditional_edges:
+            self.graph.add_conditional_edges(from_node, condition_func, {
+                key: grouped_nodes.get(to_node, to_node) for key, to_node in condition_map.items()
+            })
         
         # Compile graph
         self.compiled_graph = self.graph.compile()
         
+        _COMPILED_GRAPH_CACHE[signature] = (self.graph, self.compiled_graph)
+        if len(_COMPILED_GRAPH_CACHE) > _COMPILED_GRAPH_CACHE_SIZE:
+            _COMPILED_GRAPH_CACHE.popitem(last=False)
+        
         logger.info(f"Compiled workflow {self.workflow_id} with {len(self.nodes)} nodes")
         return self
     
     def add_edge(self, from_node: str, to_node: str) -> 'MultiAgentWorkflow':
         """Add an edge between two nodes"""
-        if not self.graph:
-            raise ValueError("Must create graph before adding edges")
-        
-        self.graph.add_edge(from_node, to_node)
+        self.edges.append((from_node, to_node))
         logger.info(f"Added edge: {from_node} -> {to_node}")
         return self
     
@@ -309,19 +807,42 @@ class MultiAgentWorkflow:
         condition_map: Dict[str, str]
     ) -> 'MultiAgentWorkflow':
         """Add a conditional edge that routes based on state"""
-        if not self.graph:
-            raise ValueError("Must create graph before adding edges")
-        
-        self.graph.add_conditional_edges(from_node, condition_func, condition_map)
+        self.conditional_edges.append((from_node, condition_func, condition_map))
         logger.info(f"Added conditional edge from {from_node}")
         return self
     
+    def set_entry_conditional(
+        self,
+        condition_func: Callable,
+        condition_map: Dict[str, str]
+    ) -> 'MultiAgentWorkflow':
+        """Choose the first node at run time instead of starting at the first node added"""
+        return self.add_conditional_edge(START, condition_func, condition_map)
+    
+    def route_with_command(
+        self,
+        from_node: str,
+        condition_func: Callable,
+        condition_map: Optional[Dict[str, str]] = None
+    ) -> 'MultiAgentWorkflow':
+        """
+        Route from a node by returning a LangGraph ``Command`` from the node itself
+        
+        Unlike ``add_conditional_edge`` the state update and the routing
+        decision are applied together, saving a separate branch step.
+        ``condition_func`` receives the state with the node's update applied
+        and returns a node name (or a key of ``condition_map``).
+        """
+        if from_node not in self.nodes:
+            raise ValueError(f"Unknown node for command routing: {from_node}")
+        
+        self.command_routes[from_node] = (condition_func, condition_map)
+        logger.info(f"Added command routing from {from_node}")
+        return self
+    
     def finish_at(self, node_name: str) -> 'MultiAgentWorkflow':
         """Mark a node as a terminal node"""
-        if not self.graph:
-            raise ValueError("Must create graph before setting terminal nodes")
-        
-        self.graph.add_edge(node_name, END)
+        self.edges.append((node_name, END))
         logger.info(f"Set {node_name} as terminal node")
         return self
     
@@ -334,67 +855,81 @@ class MultiAgentWorkflow:
         if not self.compiled_graph:
             raise ValueError("Workflow must be compiled before execution")
         
-        # Create initial state
-        initial_state: WorkflowState = {
-            "workflow_id": self.workflow_id,
-            "status": WorkflowStatus.RUNNING,
-            "current_step": "",
+        if not self._agents_prewarmed:
+            await self._prewarm_agents()
+        
+        # Create initial state from the compile-time template; mutable
+        # containers are created fresh for every execution
+        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
+        initial_state: WorkflowState = self._state_template.copy()
+        initial_state.update({
             "steps_completed": [],
             "initial_input": initial_input,
             "current_input": initial_input,
-            "final_output": None,
             "active_agents": [],
             "agent_outputs": {},
-            "messages": [HumanMessage(content=str(initial_input))],
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
-            "execution_time": 0.0,
-            "error_message": None
-        }
+            "messages": [HumanMessage(content=_serialize_input(initial_input))],
+            "created_at": start_time,
+            "updated_at": start_time
+        })
         
-        start_time = datetime.now()
+        # Last full state seen, so a failure can report the steps that finished
+        last_state: Dict[str, Any] = initial_state
         
         try:
-            logger.info(f"Starting workflow execution: {self.workflow_id}")
+            logger.opt(lazy=True).debug("Starting workflow execution: {}", lambda: self.workflow_id)
+            
+            # Executors look up the running workflow in the config
+            config = dict(config or {})
+            config["configurable"] = {**config.get("configurable", {}), "workflow": self}
             
             # Execute workflow
-            final_state = await self.compiled_graph.ainvoke(
-                initial_state, 
-                config=config or {}
-            )
+            async for state in self.compiled_graph.astream(
+                initial_state,
+                config=config,
+                stream_mode="values"
+            ):
+                last_state = state
+            final_state = last_state
             
             # Update final state
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
+            end_time = datetime.now()
             final_state["execution_time"] = execution_time
-            final_state["updated_at"] = datetime.now()
+            final_state["updated_at"] = end_time
             
-            if final_state.get("status") != WorkflowStatus.FAILED:
-                final_state["status"] = WorkflowStatus.COMPLETED
+            if final_state.get("status") != _FAILED:
+                final_state["status"] = _COMPLETED
                 final_state["final_output"] = final_state.get("current_input")
             
             # Add to execution history
             self.execution_history.append({
                 "execution_id": f"{self.workflow_id}_{start_time.timestamp()}",
                 "start_time": start_time,
-                "end_time": datetime.now(),
+                "end_time": end_time,
                 "execution_time": execution_time,
                 "status": final_state["status"],
                 "steps_completed": final_state["steps_completed"],
-                "final_output": final_state.get("final_output")
+                # Only a bounded preview is kept; the full output is returned to the caller
+                "final_output": repr(final_state.get("final_output"))[:_HISTORY_OUTPUT_PREVIEW]
             })
             
-            logger.info(f"Workflow execution completed: {self.workflow_id}")
+            logger.opt(lazy=True).debug("Workflow execution completed: {}", lambda: self.workflow_id)
             return final_state
             
         except Exception as e:
             logger.error(f"Workflow execution failed: {self.workflow_id} - {str(e)}")
             
-            # Create error state
-            error_state = initial_state.copy()
+            # Create error state from the last completed step; node failures
+            # end the run at the failing node
+            error_state = dict(last_state)
+            if isinstance(e, WorkflowNodeException):
+                error_state["current_step"] = e.node_name
             error_state.update({
-                "status": WorkflowStatus.FAILED,
+                "status": _FAILED,
                 "error_message": str(e),
-                "execution_time": (datetime.now() - start_time).total_seconds(),
+                "execution_time": (time.perf_counter_ns() - start_ns) / 1e9,
                 "updated_at": datetime.now()
             })
             
@@ -407,7 +942,7 @@ class WorkflowBuilder:
     """
     
     def __init__(self, agent_manager: Optional[AgentManager] = None):
-        self.agent_manager = agent_manager or AgentManager()
+        self.agent_manager = agent_manager or AgentManager.instance()
     
     def create_research_workflow(self, workflow_id: str = None) -> MultiAgentWorkflow:
         """
@@ -447,7 +982,6 @@ class WorkflowBuilder:
         ))
         
         # Build graph structure
-        workflow.compile()
         workflow.add_edge("planner", "researcher")
         workflow.add_edge("researcher", "synthesizer")
         workflow.finish_at("synthesizer")
@@ -475,24 +1009,10 @@ class WorkflowBuilder:
             agent_manager=self.agent_manager
         )
         
-        # Custom extraction function
-        async def extract_content(state: WorkflowState) -> Dict[str, Any]:
-            """Extract content from document"""
-            # This would integrate with actual document processing tools
-            doc_input = state.get("current_input", {})
-            extracted_content = f"Extracted content from: {doc_input}"
-            
-            return {
-                "current_input": {
-                    "message": f"Please analyze this content: {extracted_content}",
-                    "content": extracted_content
-                }
-            }
-        
         # Add nodes
         workflow.add_node(WorkflowNode(
             name="extractor",
-            function=extract_content
+            function=_extract_document_content
         ))
         
         workflow.add_node(WorkflowNode(
@@ -506,7 +1026,6 @@ class WorkflowBuilder:
         ))
         
         # Build graph structure
-        workflow.compile()
         workflow.add_edge("extractor", "analyzer")
         workflow.add_edge("analyzer", "summarizer")
         workflow.finish_at("summarizer")
@@ -529,16 +1048,6 @@ class WorkflowBuilder:
             agent_manager=self.agent_manager
         )
         
-        # Route based on input type
-        def route_input(state: WorkflowState) -> str:
-            """Route to different processors based on input type"""
-            current_input = state.get("current_input", {})
-            
-            if "image" in current_input or "file_path" in current_input:
-                return "vision_processor"
-            else:
-                return "text_processor"
-        
         # Add nodes
         workflow.add_node(WorkflowNode(
             name="vision_processor",
@@ -556,10 +1065,8 @@ class WorkflowBuilder:
         ))
         
         # Build graph structure with conditional routing
-        workflow.compile()
-        workflow.add_conditional_edge(
-            "START", 
-            route_input, 
+        workflow.set_entry_conditional(
+            _route_multimodal_input, 
             {
                 "vision_processor": "vision_processor",
                 "text_processor": "text_processor"
@@ -37,10 +37,19 @@ Example Usage:
     ```
 """
 
+import asyncio
+import functools
+import io
+import itertools
 import json
+import mmap
 import os
+import re
+import threading
+import weakref
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Callable, Tuple, Union
 from pathlib import Path
 from abc import ABC, abstractmethod
 
@@ -53,7 +62,43 @@ from langchain_core.prompts import (
     MessagesPlaceholder
 )
 from langchain_core.messages import BaseMessage
-from pydantic import BaseModel, Field, validator
+from loguru import logger
+from pydantic import BaseModel, Field, PrivateAttr, validator
+
+try:
+    # Faster JSON parser/serializer - install with: pip install orjson
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for the stdlib json path (orjson handles datetimes natively)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Template files at least this large are memory-mapped instead of read;
+# below it a plain read is cheaper than setting up the mapping
+_MMAP_MIN_SIZE = 64 * 1024
+
+# Append-only change log kept next to the template files, and how many
+# appends may go by between fsyncs
+_LOG_FILE_NAME = "templates.log"
+_LOG_FSYNC_EVERY = 32
+
+# Single-brace {var} placeholders; doubled braces are escapes and are skipped
+_PLACEHOLDER_RE = re.compile(r"(?<!\{)\{([A-Za-z_][A-Za-z0-9_]*)\}(?!\})")
+
+# Coercion applied to incoming values per PromptVariable.type; each target
+# is a type, so it doubles as the exact-type check that skips coercion
+_COERCE: Dict[str, type] = {
+    "string": str,
+    "integer": int,
+    "float": float,
+    "boolean": bool,
+}
 
 
 class PromptVariable(BaseModel):
@@ -66,6 +111,40 @@ class PromptVariable(BaseModel):
     validation_pattern: Optional[str] = None  # regex pattern for validation
     min_length: Optional[int] = None
     max_length: Optional[int] = None
+    
+    _compiled_pattern: Optional[re.Pattern] = PrivateAttr(default=None)
+    
+    def __init__(self, **data):
+        super().__init__(**data)
+        # Compile once so validation never goes through re's internal cache
+        if self.validation_pattern:
+            self._compiled_pattern = re.compile(self.validation_pattern)
+    
+    @classmethod
+    def intern(cls, **data) -> "PromptVariable":
+        """
+        Return a shared instance for an identical variable definition
+        
+        Interned variables are shared between templates and must be treated
+        as immutable.
+        """
+        fields = cls.model_fields
+        # Pair values with their type so 1, 1.0 and True stay distinct
+        key = tuple(
+            (type(value), value)
+            for value in (data.get(name, field.default) for name, field in fields.items())
+        )
+        try:
+            variable = _VARIABLE_POOL.get(key)
+        except TypeError:  # unhashable default_value
+            return cls(**data)
+        if variable is None:
+            variable = _VARIABLE_POOL[key] = cls(**data)
+        return variable
+
+
+# Identical variable definitions share one instance while any template uses it
+_VARIABLE_POOL: "weakref.WeakValueDictionary[tuple, PromptVariable]" = weakref.WeakValueDictionary()
 
 
 class PromptMetadata(BaseModel):
@@ -83,6 +162,12 @@ class PromptMetadata(BaseModel):
     variables: List[PromptVariable] = Field(default_factory=list)
     usage_count: int = 0
     success_rate: float = 1.0
+    
+    def record_use(self):
+        """Increment usage_count on the hot path"""
+        # Fields live in __dict__ on pydantic v2 models; writing there skips
+        # BaseModel.__setattr__, which costs several times the increment
+        self.__dict__["usage_count"] += 1
 
 
 class TemplateConfig(BaseModel):
@@ -93,61 +178,197 @@ class TemplateConfig(BaseModel):
     validation_enabled: bool = True
     cache_templates: bool = True
     max_cache_size: int = 100
+    fast_format: bool = False  # format simple templates with str.format, bypassing LangChain hooks
+    append_log: bool = False  # persist changes to an append-only log; see PromptManager.compact()
+    # Rendered prompts kept for repeated variables. Off by default: prompts
+    # usually carry per-request values, so entries are rarely hit again
+    max_render_cache_size: int = 0
+
+
+class _TemplateIdTrie:
+    """Character trie over template IDs for prefix lookups"""
+    
+    _END = ""  # marks a complete ID; never collides with a single character
+    
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+    
+    def add(self, template_id: str):
+        node = self._root
+        for ch in template_id:
+            node = node.setdefault(ch, {})
+        node[self._END] = template_id
+    
+    def discard(self, template_id: str):
+        path = []
+        node = self._root
+        for ch in template_id:
+            child = node.get(ch)
+            if child is None:
+                return
+            path.append((node, ch))
+            node = child
+        if node.pop(self._END, None) is None:
+            return
+        # Prune branches that no longer lead to any ID
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+    
+    def with_prefix(self, prefix: str) -> List[str]:
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == self._END:
+                    found.append(child)
+                else:
+                    stack.append(child)
+        return found
+
+
+# Compiled LangChain templates are shared by content, so identical bodies
+# registered under different ids (or reloaded from disk) are parsed once
+@functools.lru_cache(maxsize=256)
+def _compile_simple(template_text: str, input_variables: Tuple[str, ...]) -> PromptTemplate:
+    return PromptTemplate(template=template_text, input_variables=list(input_variables))
+
+
+_MESSAGE_PART_BUILDERS: Dict[str, Callable[[str], Any]] = {
+    "system": SystemMessagePromptTemplate.from_template,
+    "human": HumanMessagePromptTemplate.from_template,
+    "assistant": AIMessagePromptTemplate.from_template,
+    "placeholder": lambda name: MessagesPlaceholder(variable_name=name),
+}
+
+
+# Message parts are interned so boilerplate shared by many chat templates
+# (e.g. a common system message) is parsed and stored once
+@functools.lru_cache(maxsize=512)
+def _message_part(role: str, content: str) -> Any:
+    build = _MESSAGE_PART_BUILDERS.get(role)
+    return build(content) if build is not None else None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_chat(
+    system_message: Optional[str],
+    messages: Tuple[Tuple[str, str], ...]
+) -> ChatPromptTemplate:
+    template_messages = []
+    
+    # Add system message if provided
+    if system_message:
+        template_messages.append(_message_part("system", system_message))
+    
+    # Add other messages (unknown roles are skipped)
+    for role, content in messages:
+        part = _message_part(role, content)
+        if part is not None:
+            template_messages.append(part)
+    
+    return ChatPromptTemplate.from_messages(template_messages)
 
 
 class BasePromptTemplate(ABC):
     """Base class for all prompt templates"""
     
+    __slots__ = ("metadata", "_template", "_compiled", "_plan", "_names", "_fast_keys", "_fast_fmt")
+    
     def __init__(self, metadata: PromptMetadata):
         self.metadata = metadata
         self._template = None
         self._compiled = False
+        self._plan: Optional[List[tuple]] = None
+        self._names: Optional[Tuple[str, ...]] = None
+        self._fast_keys: Optional[frozenset] = None
+        self._fast_fmt: Optional[Callable[..., str]] = None
     
     @abstractmethod
     def compile(self) -> Union[PromptTemplate, ChatPromptTemplate]:
         """Compile the template into a LangChain template"""
         pass
     
+    def _build_plan(self) -> List[tuple]:
+        """Flatten the variable definitions into tuples for validate_variables"""
+        plan = []
+        for var_def in self.metadata.variables:
+            is_string = var_def.type == "string"
+            plan.append((
+                var_def.name,
+                var_def.required,
+                var_def.default_value,
+                _COERCE.get(var_def.type),
+                (var_def.min_length or None) if is_string else None,
+                (var_def.max_length or None) if is_string else None,
+                var_def._compiled_pattern,
+            ))
+        self._plan = plan
+        self._names = tuple(entry[0] for entry in plan)
+        # When every variable is an unconstrained string, an input that
+        # supplies exactly those names as str values is already valid
+        unconstrained = all(
+            coerce is str and min_len is None and max_len is None and pattern is None
+            for _, _, _, coerce, min_len, max_len, pattern in plan
+        )
+        self._fast_keys = frozenset(self._names) if unconstrained else None
+        return plan
+    
+    def variable_names(self) -> Tuple[str, ...]:
+        """Declared variable names, cached with the validation plan"""
+        if self._plan is None:
+            self._build_plan()
+        return self._names
+    
     def validate_variables(self, variables: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and process variables"""
+        plan = self._plan
+        if plan is None:
+            plan = self._build_plan()
+        
+        fast_keys = self._fast_keys
+        if (
+            fast_keys is not None
+            and variables.keys() == fast_keys
+            and all(type(value) is str for value in variables.values())
+        ):
+            return variables
+        
         validated = {}
         
-        for var_def in self.metadata.variables:
-            var_name = var_def.name
+        for name, required, default, coerce, min_len, max_len, pattern in plan:
+            if name not in variables:
+                if required:
+                    if default is None:
+                        raise ValueError(f"Required variable '{name}' is missing")
+                    validated[name] = default
+                continue
             
-            if var_def.required and var_name not in variables:
-                if var_def.default_value is not None:
-                    validated[var_name] = var_def.default_value
-                else:
-                    raise ValueError(f"Required variable '{var_name}' is missing")
+            value = variables[name]
             
-            if var_name in variables:
-                value = variables[var_name]
-                
-                # Type validation
-                if var_def.type == "string" and not isinstance(value, str):
-                    value = str(value)
-                elif var_def.type == "integer":
-                    value = int(value)
-                elif var_def.type == "float":
-                    value = float(value)
-                elif var_def.type == "boolean":
-                    value = bool(value)
-                
-                # Length validation for strings
-                if var_def.type == "string":
-                    if var_def.min_length and len(value) < var_def.min_length:
-                        raise ValueError(f"Variable '{var_name}' is too short (min: {var_def.min_length})")
-                    if var_def.max_length and len(value) > var_def.max_length:
-                        raise ValueError(f"Variable '{var_name}' is too long (max: {var_def.max_length})")
-                
-                # Pattern validation
-                if var_def.validation_pattern:
-                    import re
-                    if not re.match(var_def.validation_pattern, str(value)):
-                        raise ValueError(f"Variable '{var_name}' does not match required pattern")
-                
-                validated[var_name] = value
+            # Type coercion (exact type check: bool must not pass as int)
+            if coerce is not None and type(value) is not coerce:
+                value = coerce(value)
+            
+            # Length validation (only set for string variables)
+            if min_len is not None and len(value) < min_len:
+                raise ValueError(f"Variable '{name}' is too short (min: {min_len})")
+            if max_len is not None and len(value) > max_len:
+                raise ValueError(f"Variable '{name}' is too long (max: {max_len})")
+            
+            # Pattern validation
+            if pattern is not None:
+                if not pattern.match(value if isinstance(value, str) else str(value)):
+                    raise ValueError(f"Variable '{name}' does not match required pattern")
+            
+            validated[name] = value
         
         return validated
 
@@ -155,6 +376,8 @@ class BasePromptTemplate(ABC):
 class SimplePromptTemplate(BasePromptTemplate):
     """Simple text-based prompt template"""
     
+    __slots__ = ("template_text",)
+    
     def __init__(self, metadata: PromptMetadata, template_text: str):
         super().__init__(metadata)
         self.template_text = template_text
@@ -162,11 +385,10 @@ class SimplePromptTemplate(BasePromptTemplate):
     def compile(self) -> PromptTemplate:
         """Compile to LangChain PromptTemplate"""
         if not self._compiled:
-            input_variables = [var.name for var in self.metadata.variables]
-            self._template = PromptTemplate(
-                template=self.template_text,
-                input_variables=input_variables
-            )
+            self._template = _compile_simple(self.template_text, self.variable_names())
+            # LangChain has validated the f-string by now, so the body can be
+            # formatted directly by str.format
+            self._fast_fmt = self.template_text.format
             self._compiled = True
         
         return self._template
@@ -175,6 +397,8 @@ class SimplePromptTemplate(BasePromptTemplate):
 class ChatPromptTemplateWrapper(BasePromptTemplate):
     """Chat-based prompt template with multiple messages"""
     
+    __slots__ = ("system_message", "messages")
+    
     def __init__(
         self,
         metadata: PromptMetadata,
@@ -188,42 +412,29 @@ class ChatPromptTemplateWrapper(BasePromptTemplate):
     def compile(self) -> ChatPromptTemplate:
         """Compile to LangChain ChatPromptTemplate"""
         if not self._compiled:
-            template_messages = []
-            
-            # Add system message if provided
-            if self.system_message:
-                template_messages.append(
-                    SystemMessagePromptTemplate.from_template(self.system_message)
+            self._template = _compile_chat(
+                self.system_message,
+                tuple(
+                    (msg.get("role", "human"), msg.get("content", ""))
+                    for msg in self.messages
                 )
-            
-            # Add other messages
-            for msg in self.messages:
-                role = msg.get("role", "human")
-                content = msg.get("content", "")
-                
-                if role == "system":
-                    template_messages.append(
-                        SystemMessagePromptTemplate.from_template(content)
-                    )
-                elif role == "human":
-                    template_messages.append(
-                        HumanMessagePromptTemplate.from_template(content)
-                    )
-                elif role == "assistant":
-                    template_messages.append(
-                        AIMessagePromptTemplate.from_template(content)
-                    )
-                elif role == "placeholder":
-                    template_messages.append(
-                        MessagesPlaceholder(variable_name=content)
-                    )
-            
-            self._template = ChatPromptTemplate.from_messages(template_messages)
+            )
             self._compiled = True
         
         return self._template
 
 
+def _copy_rendered(result: Union[str, List[BaseMessage]]) -> Union[str, List[BaseMessage]]:
+    """Copy a cached chat rendering so callers cannot mutate the cached messages"""
+    if isinstance(result, str):
+        return result
+    return [message.model_copy() for message in result]
+
+
+# Process-wide manager shared by agents using the default template directory
+_prompt_manager: Optional["PromptManager"] = None
+
+
 class PromptManager:
     """
     Centralized manager for prompt templates
@@ -232,8 +443,21 @@ class PromptManager:
     def __init__(self, config: Optional[TemplateConfig] = None):
         self.config = config or TemplateConfig()
         self.templates: Dict[str, BasePromptTemplate] = {}
-        self.template_cache: Dict[str, Union[PromptTemplate, ChatPromptTemplate]] = {}
+        self.template_cache: "OrderedDict[str, Union[PromptTemplate, ChatPromptTemplate]]" = OrderedDict()
+        self._render_cache: "OrderedDict[tuple, Tuple[BasePromptTemplate, Any]]" = OrderedDict()
         self.template_files: Dict[str, Path] = {}
+        self._pending_saves: Dict[str, asyncio.Task] = {}  # latest file write/delete per id
+        self._id_index = _TemplateIdTrie()
+        self._by_category: Dict[str, set] = defaultdict(set)
+        self._by_tag: Dict[str, set] = defaultdict(set)
+        # (category, tags, registration sequence) as indexed, per template id
+        self._indexed_keys: Dict[str, Tuple[str, Tuple[str, ...], int]] = {}
+        self._sequence = itertools.count()
+        self._log_path = Path(self.config.templates_dir) / _LOG_FILE_NAME
+        self._log_file = None
+        self._log_lock = threading.Lock()
+        self._log_unsynced = 0
+        self._log_dirty: set = set()  # ids whose latest state is only in the log
         
         # Ensure templates directory exists
         os.makedirs(self.config.templates_dir, exist_ok=True)
@@ -241,6 +465,14 @@ class PromptManager:
         # Load existing templates
         self._load_templates_from_files()
     
+    @classmethod
+    def instance(cls) -> "PromptManager":
+        """Get the process-wide prompt manager, creating it on first use"""
+        global _prompt_manager
+        if _prompt_manager is None:
+            _prompt_manager = cls()
+        return _prompt_manager
+    
     def register_template(
         self,
         template_id: str,
@@ -255,16 +487,104 @@ class PromptManager:
         template.metadata.id = template_id
         template.metadata.updated_at = datetime.now()
         
-        # Store template
+        # Store template; variable definitions may have changed since the
+        # validation plan was built
+        template._plan = None
         self.templates[template_id] = template
+        self._index_template(template_id, template)
         
         # Clear cache
         if template_id in self.template_cache:
             del self.template_cache[template_id]
+        self._render_cache.clear()
+        
+        # Save to file if requested; inside an event loop the write runs in
+        # a worker thread so callers are not blocked on disk. Log appends are
+        # O(entry) and must stay ordered with deletes, so they run inline.
+        if save_to_file and self.config.append_log:
+            self._append_log({"op": "upsert", "id": template_id, "data": self._template_to_data(template)})
+            self.template_files[template_id] = Path(self.config.templates_dir) / f"{template_id}.json"
+        elif save_to_file:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                self._save_template_to_file(template_id, template)
+            else:
+                # Snapshot now so later mutations don't race the write
+                file_path = Path(self.config.templates_dir) / f"{template_id}.json"
+                self.template_files[template_id] = file_path
+                self._schedule_file_op(
+                    template_id, self._write_template_file, file_path, self._template_to_data(template)
+                )
+    
+    async def aregister_template(
+        self,
+        template_id: str,
+        template: BasePromptTemplate,
+        save_to_file: bool = None
+    ):
+        """Register a template and wait for its file to be written"""
+        self.register_template(template_id, template, save_to_file)
+        pending = self._pending_saves.get(template_id)
+        if pending is not None:
+            await pending
+    
+    async def flush(self):
+        """Wait for template saves scheduled by register_template"""
+        if self._pending_saves:
+            await asyncio.gather(*self._pending_saves.values())
+        if self._log_file is not None:
+            await asyncio.to_thread(self._sync_log)
+    
+    def _schedule_file_op(self, template_id: str, operation: Callable, *args) -> asyncio.Task:
+        """
+        Run a template file write or delete in a worker thread
         
-        # Save to file if requested
-        if save_to_file:
-            self._save_template_to_file(template_id, template)
+        Operations on the same template run one after another in the order
+        they were scheduled, so a delete never races an earlier write.
+        """
+        previous = self._pending_saves.get(template_id)
+        task = asyncio.get_running_loop().create_task(self._run_file_op(previous, operation, *args))
+        self._pending_saves[template_id] = task
+        task.add_done_callback(functools.partial(self._file_op_done, template_id))
+        return task
+    
+    @staticmethod
+    async def _run_file_op(previous: Optional[asyncio.Task], operation: Callable, *args):
+        if previous is not None:
+            # Only ordering matters here; the previous op reports its own errors
+            await asyncio.wait([previous])
+        await asyncio.to_thread(operation, *args)
+    
+    def _file_op_done(self, template_id: str, task: asyncio.Task):
+        if self._pending_saves.get(template_id) is task:
+            del self._pending_saves[template_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to update template file for '{template_id}': {task.exception()}")
+    
+    def compact(self):
+        """Fold the append-only log back into per-template JSON files"""
+        with self._log_lock:
+            for template_id in self._log_dirty:
+                file_path = Path(self.config.templates_dir) / f"{template_id}.json"
+                template = self.templates.get(template_id)
+                if template is not None:
+                    self._write_template_file(file_path, self._template_to_data(template))
+                    self.template_files[template_id] = file_path
+                elif file_path.exists():
+                    file_path.unlink()
+            self._log_dirty.clear()
+            
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            self._log_unsynced = 0
+            if self._log_path.exists():
+                self._log_path.unlink()
+    
+    async def reload_templates(self):
+        """Reload templates from disk without blocking the event loop"""
+        await self._aload_templates_from_files()
     
     async def get_prompt(
         self,
@@ -283,33 +603,63 @@ class PromptManager:
         if not template:
             raise ValueError(f"Template '{template_id}' not found")
         
+        # Rendering is deterministic in the template and its inputs, so
+        # repeated variables reuse the previous result. Entries remember the
+        # template object they were rendered from, so a template replaced
+        # by a reload is never served stale.
+        render_key = None
+        if self.config.max_render_cache_size > 0:
+            try:
+                # Value types are part of the key: 1, 1.0 and True hash alike
+                render_key = (
+                    template_id,
+                    validate,
+                    frozenset((name, type(value), value) for name, value in variables.items())
+                )
+                entry = self._render_cache.get(render_key)
+            except TypeError:  # unhashable variable values
+                render_key = entry = None
+            if entry is not None and entry[0] is template:
+                self._render_cache.move_to_end(render_key)
+                template.metadata.record_use()
+                return _copy_rendered(entry[1])
+        
         # Validate variables
         if validate:
             variables = template.validate_variables(variables)
         
         # Get compiled template from cache or compile
-        if self.config.cache_templates and template_id in self.template_cache:
-            compiled_template = self.template_cache[template_id]
+        cache = self.template_cache
+        if self.config.cache_templates and template_id in cache:
+            cache.move_to_end(template_id)
+            compiled_template = cache[template_id]
         else:
             compiled_template = template.compile()
             
             if self.config.cache_templates:
-                self.template_cache[template_id] = compiled_template
+                cache[template_id] = compiled_template
                 
-                # Manage cache size
-                if len(self.template_cache) > self.config.max_cache_size:
-                    # Remove oldest entry (simple FIFO)
-                    oldest_key = next(iter(self.template_cache))
-                    del self.template_cache[oldest_key]
+                # Manage cache size (evict least recently used)
+                if len(cache) > self.config.max_cache_size:
+                    cache.popitem(last=False)
         
         # Format prompt
-        if isinstance(compiled_template, PromptTemplate):
+        if self.config.fast_format and template._fast_fmt is not None:
+            result = template._fast_fmt(**variables)
+        elif isinstance(compiled_template, PromptTemplate):
             result = compiled_template.format(**variables)
         else:  # ChatPromptTemplate
             result = compiled_template.format_messages(**variables)
         
+        if render_key is not None:
+            render_cache = self._render_cache
+            render_cache[render_key] = (template, result)
+            if len(render_cache) > self.config.max_render_cache_size:
+                render_cache.popitem(last=False)
+            result = _copy_rendered(result)
+        
         # Update usage statistics
-        template.metadata.usage_count += 1
+        template.metadata.record_use()
         
         return result
     
@@ -320,23 +670,74 @@ class PromptManager:
     def list_templates(
         self,
         category: Optional[str] = None,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        id_prefix: Optional[str] = None
     ) -> List[PromptMetadata]:
         """List available templates with optional filtering"""
-        templates = []
+        # Narrow down through the indices with set algebra; only an
+        # unfiltered listing walks every template
+        candidates: Optional[set] = None
         
-        for template in self.templates.values():
-            # Filter by category
-            if category and template.metadata.category != category:
-                continue
-            
-            # Filter by tags
-            if tags and not any(tag in template.metadata.tags for tag in tags):
-                continue
-            
-            templates.append(template.metadata)
+        if id_prefix:
+            candidates = set(self._id_index.with_prefix(id_prefix))
+        
+        if category:
+            ids = self._by_category.get(category, set())
+            candidates = ids if candidates is None else candidates & ids
         
-        return templates
+        if tags:
+            ids = set().union(*(self._by_tag.get(tag, ()) for tag in tags))
+            candidates = ids if candidates is None else candidates & ids
+        
+        if candidates is None:
+            return [template.metadata for template in self.templates.values()]
+        # Same order as the unfiltered listing: by registration
+        indexed_keys = self._indexed_keys
+        return [
+            self.templates[i].metadata
+            for i in sorted(candidates, key=lambda i: indexed_keys[i][2])
+        ]
+    
+    def update_template(self, template_id: str, save_to_file: bool = None, **changes):
+        """
+        Change metadata fields of a registered template
+        
+        Use this (or register the template again) rather than editing
+        ``metadata`` in place, so the category and tag indices stay current.
+        """
+        template = self.get_template(template_id)
+        if not template:
+            raise ValueError(f"Template '{template_id}' not found")
+        for field, value in changes.items():
+            setattr(template.metadata, field, value)
+        self.register_template(template_id, template, save_to_file)
+    
+    def _index_template(self, template_id: str, template: BasePromptTemplate):
+        """Add a template to the ID, category and tag indices"""
+        # Re-registering keeps the original position, as in self.templates
+        previous = self._indexed_keys.get(template_id)
+        sequence = previous[2] if previous is not None else next(self._sequence)
+        self._unindex_template(template_id)
+        category = template.metadata.category
+        tags = tuple(template.metadata.tags)
+        self._id_index.add(template_id)
+        self._by_category[category].add(template_id)
+        for tag in tags:
+            self._by_tag[tag].add(template_id)
+        self._indexed_keys[template_id] = (category, tags, sequence)
+    
+    def _unindex_template(self, template_id: str):
+        keys = self._indexed_keys.pop(template_id, None)
+        if keys is None:
+            return
+        category, tags, _ = keys
+        self._id_index.discard(template_id)
+        for index, key in [(self._by_category, category), *((self._by_tag, tag) for tag in tags)]:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(template_id)
+                if not ids:
+                    del index[key]
     
     def delete_template(self, template_id: str, delete_file: bool = True):
         """Delete a template"""
@@ -345,17 +746,23 @@ class PromptManager:
         
         # Remove from memory
         del self.templates[template_id]
+        self._unindex_template(template_id)
         
         # Remove from cache
         if template_id in self.template_cache:
             del self.template_cache[template_id]
+        self._render_cache.clear()
         
         # Delete file
+        if delete_file and self.config.append_log:
+            self._append_log({"op": "delete", "id": template_id})
         if delete_file and template_id in self.template_files:
-            file_path = self.template_files[template_id]
-            if file_path.exists():
+            file_path = self.template_files.pop(template_id)
+            if template_id in self._pending_saves:
+                # Remove the file only after the scheduled write lands
+                self._schedule_file_op(template_id, functools.partial(file_path.unlink, missing_ok=True))
+            elif file_path.exists():
                 file_path.unlink()
-            del self.template_files[template_id]
     
     def create_version(self, template_id: str, new_version: str) -> str:
         """Create a new version of an existing template"""
@@ -369,12 +776,18 @@ class PromptManager:
         # Create new versioned ID
         new_id = f"{template_id}_v{new_version}"
         
-        # Create copy with new metadata
-        new_metadata = template.metadata.copy()
-        new_metadata.id = new_id
-        new_metadata.version = new_version
-        new_metadata.created_at = datetime.now()
-        new_metadata.updated_at = datetime.now()
+        # Create copy with new metadata in one pass; variable definitions are
+        # shared, only the lists are fresh so edits don't leak across versions
+        now = datetime.now()
+        metadata = template.metadata
+        new_metadata = metadata.model_copy(update={
+            "id": new_id,
+            "version": new_version,
+            "created_at": now,
+            "updated_at": now,
+            "variables": list(metadata.variables),
+            "tags": list(metadata.tags),
+        })
         
         # Create new template instance (this is a simplified approach)
         if isinstance(template, SimplePromptTemplate):
@@ -395,57 +808,172 @@ class PromptManager:
     
     def _load_templates_from_files(self):
         """Load templates from JSON files"""
-        templates_dir = Path(self.config.templates_dir)
-        if not templates_dir.exists():
-            return
-        
-        for file_path in templates_dir.glob("*.json"):
+        failures = []
+        for file_path in self._template_file_paths():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                template = self._create_template_from_data(data)
-                if template:
-                    self.templates[template.metadata.id] = template
-                    self.template_files[template.metadata.id] = file_path
-                    
+                self._add_loaded_template(file_path, self._read_template_file(file_path))
             except Exception as e:
-                print(f"Error loading template from {file_path}: {e}")
+                failures.append((file_path, e))
+        self._replay_log(self._read_log(failures), failures)
+        self._report_load_failures(failures)
     
-    def _create_template_from_data(self, data: Dict[str, Any]) -> Optional[BasePromptTemplate]:
-        """Create template instance from JSON data"""
-        try:
-            # Create metadata
-            metadata_data = data["metadata"]
-            metadata_data["variables"] = [
-                PromptVariable(**var) for var in metadata_data.get("variables", [])
+    async def _aload_templates_from_files(self):
+        """Load templates from JSON files, reading them concurrently"""
+        paths = self._template_file_paths()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._read_template_file, p) for p in paths),
+            return_exceptions=True
+        )
+        failures = []
+        for file_path, data in zip(paths, results):
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                self._add_loaded_template(file_path, data)
+            except Exception as e:
+                failures.append((file_path, e))
+        # Only parsing runs in the worker; templates and indices are updated on the loop
+        entries = await asyncio.to_thread(self._read_log, failures)
+        self._replay_log(entries, failures)
+        self._report_load_failures(failures)
+    
+    def _template_file_paths(self) -> List[Path]:
+        """JSON files in the templates directory, from a single scandir pass"""
+        templates_dir = self.config.templates_dir
+        if not os.path.isdir(templates_dir):
+            return []
+        with os.scandir(templates_dir) as it:
+            return [
+                Path(entry.path) for entry in it
+                if entry.name.endswith(".json") and entry.is_file()
             ]
-            metadata = PromptMetadata(**metadata_data)
-            
-            # Create appropriate template type
-            template_type = data.get("type", "simple")
-            
-            if template_type == "simple":
-                return SimplePromptTemplate(
-                    metadata=metadata,
-                    template_text=data["template_text"]
-                )
-            elif template_type == "chat":
-                return ChatPromptTemplateWrapper(
-                    metadata=metadata,
-                    system_message=data.get("system_message"),
-                    messages=data.get("messages", [])
-                )
-            
-        except Exception as e:
-            print(f"Error creating template from data: {e}")
-            return None
+    
+    def _read_log(self, failures: List[Tuple[Path, Exception]]) -> List[Dict[str, Any]]:
+        """Parse the append-only log without touching manager state"""
+        if not self._log_path.exists():
+            return []
+        loads = orjson.loads if orjson is not None else json.loads
+        entries = []
+        with open(self._log_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(loads(line))
+                except Exception as e:
+                    # A torn final line from a crash only loses that entry
+                    failures.append((self._log_path, e))
+        return entries
+    
+    def _replay_log(self, entries: List[Dict[str, Any]], failures: List[Tuple[Path, Exception]]):
+        """Apply logged changes on top of the JSON snapshots"""
+        for entry in entries:
+            try:
+                template_id = entry["id"]
+                if entry["op"] == "upsert":
+                    self._add_loaded_template(
+                        Path(self.config.templates_dir) / f"{template_id}.json",
+                        entry["data"]
+                    )
+                elif template_id in self.templates:
+                    del self.templates[template_id]
+                    self._unindex_template(template_id)
+                    self.template_files.pop(template_id, None)
+                self._log_dirty.add(template_id)
+            except Exception as e:
+                failures.append((self._log_path, e))
+    
+    def _append_log(self, entry: Dict[str, Any]):
+        if orjson is not None:
+            line = orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+        else:
+            line = (json.dumps(entry, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+        with self._log_lock:
+            if self._log_file is None:
+                self._log_file = open(self._log_path, 'ab+')
+                # Terminate a torn last line so it can't swallow this entry
+                if self._log_file.tell():
+                    self._log_file.seek(-1, os.SEEK_END)
+                    if self._log_file.read(1) != b"\n":
+                        self._log_file.write(b"\n")
+            self._log_file.write(line)
+            self._log_file.flush()
+            self._log_dirty.add(entry["id"])
+            self._log_unsynced += 1
+            if self._log_unsynced >= _LOG_FSYNC_EVERY:
+                os.fsync(self._log_file.fileno())
+                self._log_unsynced = 0
+    
+    def _sync_log(self):
+        with self._log_lock:
+            if self._log_file is not None and self._log_unsynced:
+                self._log_file.flush()
+                os.fsync(self._log_file.fileno())
+                self._log_unsynced = 0
+    
+    def _report_load_failures(self, failures: List[Tuple[Path, Exception]]):
+        if failures:
+            logger.warning(
+                "Failed to load {} template file(s) from {}: {}",
+                len(failures),
+                self.config.templates_dir,
+                "; ".join(f"{path.name}: {error}" for path, error in failures)
+            )
+    
+    @staticmethod
+    def _read_template_file(file_path: Path) -> Dict[str, Any]:
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                    return orjson.loads(f.read())
+                # Parse large files straight from the page cache
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _add_loaded_template(self, file_path: Path, data: Dict[str, Any]):
+        template = self._create_template_from_data(data)
+        if template:
+            self.templates[template.metadata.id] = template
+            self.template_files[template.metadata.id] = file_path
+            self._index_template(template.metadata.id, template)
+    
+    def _create_template_from_data(self, data: Dict[str, Any]) -> BasePromptTemplate:
+        """Create template instance from JSON data"""
+        # Create metadata
+        metadata_data = data["metadata"]
+        metadata_data["variables"] = [
+            PromptVariable.intern(**var) for var in metadata_data.get("variables", [])
+        ]
+        metadata = PromptMetadata(**metadata_data)
+        
+        # Create appropriate template type
+        template_type = data.get("type", "simple")
+        
+        if template_type == "simple":
+            return SimplePromptTemplate(
+                metadata=metadata,
+                template_text=data["template_text"]
+            )
+        elif template_type == "chat":
+            return ChatPromptTemplateWrapper(
+                metadata=metadata,
+                system_message=data.get("system_message"),
+                messages=data.get("messages", [])
+            )
+        raise ValueError(f"Unknown template type '{template_type}'")
     
     def _save_template_to_file(self, template_id: str, template: BasePromptTemplate):
         """Save template to JSON file"""
         file_path = Path(self.config.templates_dir) / f"{template_id}.json"
-        
-        # Prepare data for saving
+        self._write_template_file(file_path, self._template_to_data(template))
+        self.template_files[template_id] = file_path
+    
+    @staticmethod
+    def _template_to_data(template: BasePromptTemplate) -> Dict[str, Any]:
+        """Prepare template data for saving"""
         data = {
             "type": "simple" if isinstance(template, SimplePromptTemplate) else "chat",
             "metadata": {
@@ -454,9 +982,9 @@ class PromptManager:
                 "description": template.metadata.description,
                 "version": template.metadata.version,
                 "author": template.metadata.author,
-                "created_at": template.metadata.created_at.isoformat(),
-                "updated_at": template.metadata.updated_at.isoformat(),
-                "tags": template.metadata.tags,
+                "created_at": template.metadata.created_at,
+                "updated_at": template.metadata.updated_at,
+                "tags": list(template.metadata.tags),
                 "category": template.metadata.category,
                 "language": template.metadata.language,
                 "variables": [var.dict() for var in template.metadata.variables],
@@ -469,13 +997,18 @@ class PromptManager:
             data["template_text"] = template.template_text
         elif isinstance(template, ChatPromptTemplateWrapper):
             data["system_message"] = template.system_message
-            data["messages"] = template.messages
+            data["messages"] = [dict(message) for message in template.messages]
         
-        # Save to file
+        return data
+    
+    @staticmethod
+    def _write_template_file(file_path: Path, data: Dict[str, Any]):
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        self.template_files[template_id] = file_path
+            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
 
 
 # Factory functions for creating common prompt templates
@@ -488,32 +1021,34 @@ def create_agent_prompt(
 ) -> ChatPromptTemplateWrapper:
     """Create a standard agent prompt template"""
     
-    system_parts = []
-    
-    if system_message:
-        system_parts.append(system_message)
-    else:
-        system_parts.append(f"You are {agent_name}, a helpful AI assistant.")
+    buf = io.StringIO()
+    buf.write(system_message or f"You are {agent_name}, a helpful AI assistant.")
     
     if task_description:
-        system_parts.append(f"Your primary task is: {task_description}")
+        buf.write("\n\nYour primary task is: ")
+        buf.write(task_description)
     
     if personality_traits:
-        traits_text = ", ".join(personality_traits)
-        system_parts.append(f"Your personality traits: {traits_text}")
+        buf.write("\n\nYour personality traits: ")
+        buf.write(", ".join(personality_traits))
     
     if constraints:
-        constraints_text = "\n".join(f"- {constraint}" for constraint in constraints)
-        system_parts.append(f"Important constraints:\n{constraints_text}")
+        buf.write("\n\nImportant constraints:")
+        for constraint in constraints:
+            buf.write("\n- ")
+            buf.write(str(constraint))
     
-    full_system_message = "\n\n".join(system_parts)
+    full_system_message = buf.getvalue()
     
     messages = [
         {"role": "human", "content": "{user_input}"}
     ]
     
+    # Discover {var} placeholders in one pass
+    placeholders = _PLACEHOLDER_RE.findall(full_system_message)
+    
     # Add context placeholder if needed
-    if "{context}" in full_system_message:
+    if "context" in placeholders:
         messages.insert(0, {"role": "placeholder", "content": "context_messages"})
     
     metadata = PromptMetadata(
@@ -522,15 +1057,28 @@ def create_agent_prompt(
         description=f"Standard prompt for {agent_name} agent",
         category="agent",
         variables=[
-            PromptVariable(name="user_input", description="User's input message"),
+            PromptVariable.intern(name="user_input", description="User's input message"),
         ]
     )
     
-    if "{context}" in full_system_message:
+    if "context" in placeholders:
         metadata.variables.append(
-            PromptVariable(name="context_messages", description="Context messages", required=False)
+            PromptVariable.intern(name="context_messages", type="list", description="Context messages", required=False)
         )
     
+    # Declare any other system message placeholders so formatting never
+    # fails on an unknown key; they default to empty text
+    declared = {var.name for var in metadata.variables}
+    for name in dict.fromkeys(placeholders):
+        if name not in declared:
+            metadata.variables.append(
+                PromptVariable.intern(
+                    name=name,
+                    description=f"Value for {{{name}}} in the system message",
+                    default_value=""
+                )
+            )
+    
     return ChatPromptTemplateWrapper(
         metadata=metadata,
         system_message=full_system_message,
@@ -547,29 +1095,28 @@ def create_task_prompt(
 ) -> SimplePromptTemplate:
     """Create a task-specific prompt template"""
     
-    template_parts = []
-    
-    template_parts.append(f"Task: {task_type}")
-    template_parts.append(f"Instructions: {instructions}")
+    buf = io.StringIO()
+    buf.write(f"Task: {task_type}\n\nInstructions: {instructions}")
     
     if input_format:
-        template_parts.append(f"Input format: {input_format}")
+        buf.write("\n\nInput format: ")
+        buf.write(input_format)
     
     if output_format:
-        template_parts.append(f"Output format: {output_format}")
+        buf.write("\n\nOutput format: ")
+        buf.write(output_format)
     
     if examples:
-        template_parts.append("Examples:")
+        buf.write("\n\nExamples:")
         for i, example in enumerate(examples, 1):
-            template_parts.append(f"Example {i}:")
-            template_parts.append(f"Input: {example.get('input', '')}")
-            template_parts.append(f"Output: {example.get('output', '')}")
+            buf.write(
+                f"\n\nExample {i}:\n\nInput: {example.get('input', '')}"
+                f"\n\nOutput: {example.get('output', '')}"
+            )
     
-    template_parts.append("Now, please complete the following:")
-    template_parts.append("Input: {input}")
-    template_parts.append("Output:")
+    buf.write("\n\nNow, please complete the following:\n\nInput: {input}\n\nOutput:")
     
-    template_text = "\n\n".join(template_parts)
+    template_text = buf.getvalue()
     
     metadata = PromptMetadata(
         id=f"{task_type.lower()}_task",
@@ -577,7 +1124,7 @@ def create_task_prompt(
         description=f"Prompt for {task_type} tasks",
         category="task",
         variables=[
-            PromptVariable(name="input", description="Task input")
+            PromptVariable.intern(name="input", description="Task input")
         ]
     )
     
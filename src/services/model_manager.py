@@ -2,18 +2,234 @@
 Model Manager Service - Manages LLM model providers and interactions
 """
 import asyncio
+import inspect
 import time
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntFlag
+from typing import Dict, List, Optional, Any, AsyncIterator, Awaitable, Callable, Protocol, Tuple, runtime_checkable
 
+import httpx
 from loguru import logger
 
 from src.config.settings import get_settings
-from src.models.providers.openai_provider import OpenAIProvider
-from src.models.providers.anthropic_provider import AnthropicProvider
-from src.models.providers.ollama_provider import OllamaProvider
 from src.api.v1.schemas import ModelInfo, ModelTestResponse
+from src.core.exceptions import ModelProviderException, ProviderUnavailableException
 
 
+@dataclass
+class GenerationRequest:
+    """One text generation request for ModelManager.batch_generate_text"""
+    provider: str
+    model_name: str
+    messages: List[Dict[str, str]]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@runtime_checkable
+class SupportsBatchGeneration(Protocol):
+    """Providers that can serve several prompts for one model in a single call"""
+    
+    async def generate_text_batch(
+        self,
+        model_name: str,
+        batch: List[List[Dict[str, str]]],
+        **kwargs
+    ) -> List[str]:
+        ...
+
+
+class ProviderCapability(IntFlag):
+    """Optional provider features, probed once when providers are created"""
+    NONE = 0
+    STREAM = 1
+    IMAGE = 2
+    AUDIO = 4
+    LOAD = 8
+    UNLOAD = 16
+    BATCH = 32
+
+
+_CAPABILITY_METHODS = (
+    (ProviderCapability.STREAM, "generate_text_stream"),
+    (ProviderCapability.IMAGE, "process_image"),
+    (ProviderCapability.AUDIO, "transcribe_audio"),
+    (ProviderCapability.LOAD, "load_model"),
+    (ProviderCapability.UNLOAD, "unload_model"),
+    (ProviderCapability.BATCH, "generate_text_batch"),
+)
+
+
+# Calls in progress in the current task, innermost last, as
+# (breaker, generation at entry, whether the call is the half-open trial)
+_BREAKER_CALLS: ContextVar[Tuple[Tuple["CircuitBreaker", int, bool], ...]] = ContextVar(
+    "breaker_calls", default=()
+)
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker
+    
+    Opens after ``threshold`` consecutive failures; while open, calls fail
+    immediately with ProviderUnavailableException. After ``cooldown``
+    seconds one trial call is let through (half-open): success closes the
+    breaker, failure opens it again. Calls that started before the breaker
+    last opened or closed only update ``failure_count``.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, provider: str, threshold: int = 5, cooldown: float = 30.0):
+        self.provider = provider
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failure_count = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        # Bumped whenever the breaker opens or closes
+        self._generation = 0
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return self.OPEN
+        return self.HALF_OPEN
+    
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._generation += 1
+    
+    def _close(self):
+        self.failure_count = 0
+        self.opened_at = None
+        self._generation += 1
+    
+    async def __aenter__(self):
+        trial = False
+        if self.opened_at is not None:
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0 or self._trial_in_flight:
+                raise ProviderUnavailableException(self.provider, max(remaining, 0.0))
+            self._trial_in_flight = trial = True
+        _BREAKER_CALLS.set(_BREAKER_CALLS.get() + ((self, self._generation, trial),))
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        calls = _BREAKER_CALLS.get()
+        index = max(i for i, call in enumerate(calls) if call[0] is self)
+        _, generation, trial = calls[index]
+        _BREAKER_CALLS.set(calls[:index] + calls[index + 1:])
+        
+        # Cancellation is not the provider's fault and isn't counted
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        if trial:
+            self._trial_in_flight = False
+            if exc_type is None:
+                self._close()
+            elif failed:
+                self.failure_count += 1
+                self._open()
+        elif generation != self._generation:
+            # Started before the breaker last changed state: its outcome
+            # says nothing about the current state
+            if failed:
+                self.failure_count += 1
+        elif exc_type is None:
+            self.failure_count = 0
+        elif failed:
+            self.failure_count += 1
+            if self.failure_count >= self.threshold:
+                self._open()
+        return False
+
+
+class MicroBatcher:
+    """
+    Collects generate_text calls for one provider into generate_text_batch calls
+    
+    Requests wait at most ``window`` seconds (or until ``max_batch_size`` are
+    queued); each batch is split by model and kwargs and dispatched through
+    the provider's breaker and semaphore as a single request.
+    """
+    
+    def __init__(self, manager: "ModelManager", provider: str, window: float, max_batch_size: int):
+        self._manager = manager
+        self._provider = provider
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: set = set()
+    
+    async def submit(self, model_name: str, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> str:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+        future = loop.create_future()
+        self._queue.put_nowait((model_name, messages, kwargs, future))
+        return await future
+    
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+    
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self._window
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Split by model and kwargs; dispatch in the background so the
+            # next window starts collecting right away
+            groups: List[Tuple[str, Dict[str, Any], list]] = []
+            for model_name, messages, kwargs, future in batch:
+                for group_model, group_kwargs, items in groups:
+                    if group_model == model_name and group_kwargs == kwargs:
+                        items.append((messages, future))
+                        break
+                else:
+                    groups.append((model_name, kwargs, [(messages, future)]))
+            for model_name, kwargs, items in groups:
+                task = loop.create_task(self._dispatch(model_name, kwargs, items))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, model_name: str, kwargs: Dict[str, Any], items: list):
+        try:
+            outputs = await self._manager._dispatch(
+                self._provider, "generate_text_batch",
+                model_name, [messages for messages, _ in items], **kwargs
+            )
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), output in zip(items, outputs):
+            if not future.done():
+                future.set_result(output)
+
+
+# Process-wide manager shared by the API endpoints and agents
+_model_manager: Optional["ModelManager"] = None
+
 class ModelManager:
     """
     Manages all model providers and their configurations
@@ -24,35 +240,148 @@ class ModelManager:
     
     def __init__(self):
         self.settings = get_settings()
+        self._log = logger.bind(component="model_manager")
         self.providers: Dict[str, Any] = {}
+        self._caps: Dict[str, ProviderCapability] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._batchers: Dict[str, MicroBatcher] = {}
+        # alias -> ordered (provider, model_name) candidates
+        self._aliases: Dict[str, List[Tuple[str, str]]] = {
+            alias: [tuple(entry.split("/", 1)) for entry in entries if "/" in entry]
+            for alias, entries in self.settings.model_aliases.items()
+        }
+        # In-process call counters and per-(provider, model) latency EWMA,
+        # read by get_metrics() and by failover ordering
+        self._latency_ewma: Dict[Tuple[str, str], float] = {}
+        self._metrics = {"calls": Counter(), "latency_ewma": self._latency_ewma}
+        # Provider listings and model info are cached as (stored_at, value)
+        self._cache_ttl = self.settings.models_cache_ttl
+        self._models_cache: Dict[str, Tuple[float, List[ModelInfo]]] = {}
+        self._info_cache: Dict[Tuple[str, str], Tuple[float, ModelInfo]] = {}
+        self._inflight: Dict[Tuple, "asyncio.Future"] = {}
+        # One pooled client for every provider that accepts it, so TCP/TLS
+        # connections are reused across providers and requests
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=1000,
+                max_keepalive_connections=1000,
+                keepalive_expiry=75.0
+            )
+        )
         self._initialize_providers()
     
+    @classmethod
+    def instance(cls) -> "ModelManager":
+        """Get the process-wide model manager, creating it on first use"""
+        global _model_manager
+        if _model_manager is None:
+            _model_manager = cls()
+        return _model_manager
+    
+    @classmethod
+    async def close_instance(cls):
+        """Close the process-wide model manager if one was created"""
+        global _model_manager
+        if _model_manager is not None:
+            await _model_manager.aclose()
+            _model_manager = None
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client shared with the providers; closed by aclose()"""
+        return self._http
+    
+    async def aclose(self):
+        """Stop micro-batchers and close the shared HTTP client"""
+        for batcher in self._batchers.values():
+            await batcher.close()
+        await self._http.aclose()
+    
+    def _http_kwargs(self, provider_cls: type) -> Dict[str, Any]:
+        """Pass the shared client to providers whose constructor takes one"""
+        try:
+            parameters = inspect.signature(provider_cls).parameters
+        except (TypeError, ValueError):
+            return {}
+        return {"http_client": self._http} if "http_client" in parameters else {}
+    
+    def invalidate_models_cache(self, provider: Optional[str] = None):
+        """Drop cached listings and model info, for one provider or all"""
+        if provider is None:
+            self._models_cache.clear()
+            self._info_cache.clear()
+            return
+        self._models_cache.pop(provider, None)
+        for key in [key for key in self._info_cache if key[0] == provider]:
+            del self._info_cache[key]
+    
     def _initialize_providers(self):
-        """Initialize all available model providers"""
+        """
+        Initialize all available model providers
+        
+        Provider modules are imported only when the provider is configured,
+        so unused SDKs are never loaded.
+        """
         try:
             # Initialize OpenAI provider
             if self.settings.openai_api_key:
+                from src.models.providers.openai_provider import OpenAIProvider
                 self.providers["openai"] = OpenAIProvider(
                     api_key=self.settings.openai_api_key,
-                    base_url=self.settings.openai_base_url
+                    base_url=self.settings.openai_base_url,
+                    **self._http_kwargs(OpenAIProvider)
                 )
             
             # Initialize Anthropic provider
             if self.settings.anthropic_api_key:
+                from src.models.providers.anthropic_provider import AnthropicProvider
                 self.providers["anthropic"] = AnthropicProvider(
-                    api_key=self.settings.anthropic_api_key
+                    api_key=self.settings.anthropic_api_key,
+                    **self._http_kwargs(AnthropicProvider)
                 )
             
             # Initialize Ollama provider
+            from src.models.providers.ollama_provider import OllamaProvider
             self.providers["ollama"] = OllamaProvider(
                 base_url=self.settings.ollama_base_url,
-                timeout=self.settings.ollama_timeout
+                timeout=self.settings.ollama_timeout,
+                **self._http_kwargs(OllamaProvider)
             )
             
-            logger.info(f"Initialized {len(self.providers)} model providers")
+            self._log.info(f"Initialized {len(self.providers)} model providers")
             
         except Exception as e:
-            logger.error(f"Failed to initialize model providers: {str(e)}")
+            self._log.error(f"Failed to initialize model providers: {str(e)}")
+        
+        # Probe optional features once so request paths test a bit instead
+        # of calling hasattr each time
+        for name, provider_instance in self.providers.items():
+            caps = ProviderCapability.NONE
+            for flag, method_name in _CAPABILITY_METHODS:
+                if hasattr(provider_instance, method_name):
+                    caps |= flag
+            self._caps[name] = caps
+            self._breakers[name] = CircuitBreaker(
+                name,
+                threshold=self.settings.provider_failure_threshold,
+                cooldown=self.settings.provider_cooldown
+            )
+            # Bound in-flight generation requests so bursts queue here rather
+            # than tripping rate limits or overloading a local server
+            self._semaphores[name] = asyncio.Semaphore(
+                getattr(self.settings, f"{name}_max_concurrency")
+            )
+        
+        ollama_window = self.settings.ollama_batch_window_ms / 1000.0
+        if ollama_window > 0 and self._caps.get("ollama", 0) & ProviderCapability.BATCH:
+            self._batchers["ollama"] = MicroBatcher(
+                self, "ollama", ollama_window, self.settings.ollama_max_batch_size
+            )
+    
+    def get_capabilities(self, provider: str) -> ProviderCapability:
+        """Optional features supported by a provider"""
+        return self._caps.get(provider, ProviderCapability.NONE)
     
     async def list_models(
         self, 
@@ -60,42 +389,89 @@ class ModelManager:
         model_type: Optional[str] = None
     ) -> List[ModelInfo]:
         """List all available models, optionally filtered by provider or type"""
-        models = []
-        
         providers_to_check = [provider] if provider else list(self.providers.keys())
         
-        for provider_name in providers_to_check:
-            if provider_name not in self.providers:
-                continue
-                
-            try:
-                provider_instance = self.providers[provider_name]
-                provider_models = await provider_instance.list_models()
-                
-                # Filter by model type if specified
-                if model_type:
-                    provider_models = [
-                        model for model in provider_models 
-                        if model.model_type == model_type
-                    ]
-                
-                models.extend(provider_models)
-                
-            except Exception as e:
-                logger.error(f"Failed to list models for provider {provider_name}: {str(e)}")
+        # Query providers concurrently; each one handles its own failure
+        results = await asyncio.gather(*(
+            self._safe_list_models(provider_name, model_type)
+            for provider_name in providers_to_check
+            if provider_name in self.providers
+        ))
+        return [model for provider_models in results for model in provider_models]
+    
+    async def _safe_list_models(
+        self,
+        provider_name: str,
+        model_type: Optional[str] = None
+    ) -> List[ModelInfo]:
+        """List one provider's models, logging and swallowing its errors"""
+        try:
+            cached = self._models_cache.get(provider_name)
+            if cached is not None and time.monotonic() - cached[0] < self._cache_ttl:
+                provider_models = cached[1]
+            else:
+                provider_models = await self._single_flight(
+                    ("list_models", provider_name),
+                    lambda: self._fetch_models(provider_name)
+                )
+            
+            # Filter by model type if specified
+            if model_type:
+                provider_models = [
+                    model for model in provider_models 
+                    if model.model_type == model_type
+                ]
+            
+            return provider_models
+            
+        except Exception as e:
+            self._log.error(f"Failed to list models for provider {provider_name}: {str(e)}")
+            return []
+    
+    async def _fetch_models(self, provider_name: str) -> List[ModelInfo]:
+        async with self._breakers[provider_name]:
+            provider_models = await self.providers[provider_name].list_models()
+        self._models_cache[provider_name] = (time.monotonic(), provider_models)
+        return provider_models
+    
+    async def _fetch_model_info(self, provider: str, model_name: str) -> Optional[ModelInfo]:
+        async with self._breakers[provider]:
+            info = await self.providers[provider].get_model_info(model_name)
+        if info is not None:
+            self._info_cache[(provider, model_name)] = (time.monotonic(), info)
+        return info
+    
+    def _single_flight(self, key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        """
+        Share one in-flight fetch among concurrent callers with the same key
         
-        return models
+        The fetch runs as its own task and callers await it through
+        asyncio.shield, so a cancelled caller doesn't cancel it for others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return asyncio.shield(task)
     
     async def get_model_info(self, provider: str, model_name: str) -> Optional[ModelInfo]:
         """Get detailed information about a specific model"""
         if provider not in self.providers:
             return None
         
+        key = (provider, model_name)
+        cached = self._info_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self._cache_ttl:
+            return cached[1]
+        
         try:
-            provider_instance = self.providers[provider]
-            return await provider_instance.get_model_info(model_name)
+            return await self._single_flight(
+                ("get_model_info", provider, model_name),
+                lambda: self._fetch_model_info(provider, model_name)
+            )
         except Exception as e:
-            logger.error(f"Failed to get model info for {provider}/{model_name}: {str(e)}")
+            self._log.error(f"Failed to get model info for {provider}/{model_name}: {str(e)}")
             return None
     
     async def test_model(
@@ -105,7 +481,7 @@ class ModelManager:
         test_message: str = "Hello, world!"
     ) -> ModelTestResponse:
         """Test a specific model with a test message"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             if provider not in self.providers:
@@ -117,49 +493,68 @@ class ModelManager:
                     latency=0.0
                 )
             
-            provider_instance = self.providers[provider]
-            response = await provider_instance.generate_text(
+            response = await self._dispatch(
+                provider, "generate_text",
                 model_name=model_name,
                 messages=[{"role": "user", "content": test_message}],
                 max_tokens=50
             )
             
-            latency = time.time() - start_time
+            latency = time.monotonic() - start_time
             
             return ModelTestResponse(
                 provider=provider,
                 model_name=model_name,
                 status="success",
                 response=response,
-                latency=round(latency, 3)
+                latency=latency
             )
             
         except Exception as e:
-            latency = time.time() - start_time
-            logger.error(f"Model test failed for {provider}/{model_name}: {str(e)}")
+            latency = time.monotonic() - start_time
+            self._log.error(f"Model test failed for {provider}/{model_name}: {str(e)}")
             
             return ModelTestResponse(
                 provider=provider,
                 model_name=model_name,
                 status="failed",
                 error=str(e),
-                latency=round(latency, 3)
+                latency=latency
             )
     
+    async def test_models(
+        self,
+        pairs: List[Tuple[str, str]],
+        test_message: str = "Hello, world!",
+        max_concurrency: int = 32
+    ) -> List[ModelTestResponse]:
+        """Test several (provider, model_name) pairs concurrently"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _test_one(provider: str, model_name: str) -> ModelTestResponse:
+            async with semaphore:
+                return await self.test_model(provider, model_name, test_message)
+        
+        # test_model reports failures in its response, so nothing raises here
+        return await asyncio.gather(*(
+            _test_one(provider, model_name) for provider, model_name in pairs
+        ))
+    
     async def load_model(self, provider: str, model_name: str) -> bool:
         """Load a model (primarily for local providers like Ollama)"""
         if provider not in self.providers:
             return False
         
         try:
-            provider_instance = self.providers[provider]
-            if hasattr(provider_instance, 'load_model'):
-                return await provider_instance.load_model(model_name)
+            if self._caps[provider] & ProviderCapability.LOAD:
+                result = await self._dispatch(provider, "load_model", model_name)
+                self.invalidate_models_cache(provider)
+                return result
             else:
-                logger.warning(f"Provider '{provider}' does not support model loading")
+                self._log.warning(f"Provider '{provider}' does not support model loading")
                 return True  # Consider it successful for cloud providers
         except Exception as e:
-            logger.error(f"Failed to load model {provider}/{model_name}: {str(e)}")
+            self._log.error(f"Failed to load model {provider}/{model_name}: {str(e)}")
             return False
     
     async def unload_model(self, provider: str, model_name: str) -> bool:
@@ -168,16 +563,60 @@ class ModelManager:
             return False
         
         try:
-            provider_instance = self.providers[provider]
-            if hasattr(provider_instance, 'unload_model'):
-                return await provider_instance.unload_model(model_name)
+            if self._caps[provider] & ProviderCapability.UNLOAD:
+                result = await self._dispatch(provider, "unload_model", model_name)
+                self.invalidate_models_cache(provider)
+                return result
             else:
-                logger.warning(f"Provider '{provider}' does not support model unloading")
+                self._log.warning(f"Provider '{provider}' does not support model unloading")
                 return True  # Consider it successful for cloud providers
         except Exception as e:
-            logger.error(f"Failed to unload model {provider}/{model_name}: {str(e)}")
+            self._log.error(f"Failed to unload model {provider}/{model_name}: {str(e)}")
             return False
     
+    def _require_provider(self, provider: str):
+        if provider not in self.providers:
+            raise ValueError(f"Provider '{provider}' not available")
+    
+    async def _dispatch(self, provider: str, method_name: str, *args, **kwargs) -> Any:
+        """
+        Call a provider method behind its circuit breaker and concurrency limit
+        
+        Every per-provider call goes through here, so availability checks and
+        instrumentation live in one place. Each call is counted by outcome and
+        successful calls update the latency EWMA for the (provider, model)
+        pair used by failover routing.
+        """
+        self._require_provider(provider)
+        method = getattr(self.providers[provider], method_name)
+        calls = self._metrics["calls"]
+        start_time = time.monotonic()
+        try:
+            async with self._breakers[provider], self._semaphores[provider]:
+                result = await method(*args, **kwargs)
+        except BaseException:
+            calls[(provider, method_name, "error")] += 1
+            raise
+        
+        calls[(provider, method_name, "ok")] += 1
+        latency = time.monotonic() - start_time
+        key = (provider, kwargs["model_name"] if "model_name" in kwargs else args[0])
+        previous = self._latency_ewma.get(key)
+        self._latency_ewma[key] = latency if previous is None else 0.8 * previous + 0.2 * latency
+        return result
+    
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot of provider call counts and latency averages
+        
+        Keys are "provider/method/outcome" for calls and "provider/model"
+        for latency_ewma (seconds), ready for an exporter to poll.
+        """
+        return {
+            "calls": {"/".join(key): count for key, count in self._metrics["calls"].items()},
+            "latency_ewma": {"/".join(key): value for key, value in self._latency_ewma.items()}
+        }
+    
     async def list_providers(self) -> List[str]:
         """List all available providers"""
         return list(self.providers.keys())
@@ -194,37 +633,129 @@ class ModelManager:
         **kwargs
     ) -> str:
         """Generate text using a specific model"""
-        if provider not in self.providers:
-            raise ValueError(f"Provider '{provider}' not available")
+        batcher = self._batchers.get(provider)
+        if batcher is not None:
+            return await batcher.submit(model_name, messages, kwargs)
+        
+        return await self._dispatch(
+            provider, "generate_text", model_name=model_name, messages=messages, **kwargs
+        )
+    
+    async def generate_text_with_failover(
+        self,
+        model_alias: str,
+        messages: List[Dict[str, str]],
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate text with the first healthy candidate configured for an alias
+        
+        Candidates come from settings.model_aliases. Ones whose breaker is
+        open are skipped, and measured candidates are tried fastest first
+        (unmeasured ones keep their configured priority and go first).
+        """
+        candidates = self._aliases.get(model_alias)
+        if not candidates:
+            raise ValueError(f"Unknown model alias '{model_alias}'")
+        
+        ewma = self._latency_ewma
+        errors = []
+        for provider, model_name in sorted(candidates, key=lambda c: ewma.get(c, 0.0)):
+            if provider not in self.providers:
+                continue
+            if self._breakers[provider].state == CircuitBreaker.OPEN:
+                errors.append(f"{provider}/{model_name}: circuit open")
+                continue
+            
+            try:
+                return await asyncio.wait_for(
+                    self.generate_text(provider, model_name, messages, **kwargs),
+                    timeout
+                )
+            except Exception as e:
+                self._log.warning(f"Failover: {provider}/{model_name} failed for '{model_alias}': {e}")
+                errors.append(f"{provider}/{model_name}: {e}")
+                continue
         
-        provider_instance = self.providers[provider]
-        return await provider_instance.generate_text(
-            model_name=model_name,
-            messages=messages,
-            **kwargs
+        raise ModelProviderException(
+            model_alias,
+            "no candidate succeeded" + (f" ({'; '.join(errors)})" if errors else "")
         )
     
-    async def generate_text_stream(
+    async def batch_generate_text(self, requests: List[GenerationRequest]) -> List[str]:
+        """
+        Generate text for many requests, grouped per (provider, model)
+        
+        Groups whose provider implements generate_text_batch and whose
+        requests share the same kwargs go out as one batched call; everything
+        else runs as concurrent generate_text calls. Results keep the order
+        of ``requests``.
+        """
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, request in enumerate(requests):
+            if request.provider not in self.providers:
+                raise ValueError(f"Provider '{request.provider}' not available")
+            groups.setdefault((request.provider, request.model_name), []).append(index)
+        
+        results: List[Optional[str]] = [None] * len(requests)
+        
+        async def _run_group(provider: str, model_name: str, indices: List[int]):
+            shared_kwargs = requests[indices[0]].kwargs
+            if (
+                self._caps[provider] & ProviderCapability.BATCH
+                and all(requests[i].kwargs == shared_kwargs for i in indices)
+            ):
+                outputs = await self._dispatch(
+                    provider, "generate_text_batch",
+                    model_name, [requests[i].messages for i in indices], **shared_kwargs
+                )
+            else:
+                outputs = await asyncio.gather(*(
+                    self.generate_text(provider, model_name, requests[i].messages, **requests[i].kwargs)
+                    for i in indices
+                ))
+            for i, output in zip(indices, outputs):
+                results[i] = output
+        
+        await asyncio.gather(*(
+            _run_group(provider, model_name, indices)
+            for (provider, model_name), indices in groups.items()
+        ))
+        return results
+    
+    def generate_text_stream(
         self,
         provider: str,
         model_name: str,
         messages: List[Dict[str, str]],
         **kwargs
-    ):
-        """Generate streaming text using a specific model"""
-        if provider not in self.providers:
-            raise ValueError(f"Provider '{provider}' not available")
+    ) -> AsyncIterator[str]:
+        """
+        Generate streaming text using a specific model
         
-        provider_instance = self.providers[provider]
-        if not hasattr(provider_instance, 'generate_text_stream'):
+        Validation runs when this is called, so an unknown provider or one
+        without streaming fails immediately instead of on first iteration.
+        """
+        if not self._caps.get(provider, ProviderCapability.NONE) & ProviderCapability.STREAM:
+            self._require_provider(provider)
             raise ValueError(f"Provider '{provider}' does not support streaming")
         
-        async for chunk in provider_instance.generate_text_stream(
-            model_name=model_name,
-            messages=messages,
-            **kwargs
-        ):
-            yield chunk
+        return self._guarded_stream(
+            provider,
+            self.providers[provider].generate_text_stream(
+                model_name=model_name,
+                messages=messages,
+                **kwargs
+            )
+        )
+    
+    async def _guarded_stream(self, provider: str, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+        # The single delegation layer: it holds the breaker and semaphore for
+        # the lifetime of the stream and otherwise passes chunks straight through
+        async with self._breakers[provider], self._semaphores[provider]:
+            async for chunk in stream:
+                yield chunk
     
     async def process_image(
         self,
@@ -235,18 +766,13 @@ class ModelManager:
         **kwargs
     ) -> str:
         """Process image with text using a vision model"""
-        if provider not in self.providers:
-            raise ValueError(f"Provider '{provider}' not available")
-        
-        provider_instance = self.providers[provider]
-        if not hasattr(provider_instance, 'process_image'):
+        if not self._caps.get(provider, ProviderCapability.NONE) & ProviderCapability.IMAGE:
+            self._require_provider(provider)
             raise ValueError(f"Provider '{provider}' does not support image processing")
         
-        return await provider_instance.process_image(
-            model_name=model_name,
-            image_data=image_data,
-            prompt=prompt,
-            **kwargs
+        return await self._dispatch(
+            provider, "process_image",
+            model_name=model_name, image_data=image_data, prompt=prompt, **kwargs
         )
     
     async def transcribe_audio(
@@ -257,15 +783,11 @@ class ModelManager:
         **kwargs
     ) -> str:
         """Transcribe audio using a speech-to-text model"""
-        if provider not in self.providers:
-            raise ValueError(f"Provider '{provider}' not available")
-        
-        provider_instance = self.providers[provider]
-        if not hasattr(provider_instance, 'transcribe_audio'):
+        if not self._caps.get(provider, ProviderCapability.NONE) & ProviderCapability.AUDIO:
+            self._require_provider(provider)
             raise ValueError(f"Provider '{provider}' does not support audio transcription")
         
-        return await provider_instance.transcribe_audio(
-            model_name=model_name,
-            audio_data=audio_data,
-            **kwargs
+        return await self._dispatch(
+            provider, "transcribe_audio",
+            model_name=model_name, audio_data=audio_data, **kwargs
         )
\ No newline at end of file
@@ -27,11 +27,22 @@ Example Usage:
     ```
 """
 
+import ast
 import asyncio
+import functools
+import io
+import ipaddress
 import json
-import hashlib
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import math
+import operator
+import socket
+import time
+import types
+from collections import OrderedDict
+from contextlib import asynccontextmanager, redirect_stdout, redirect_stderr
+from contextvars import ContextVar
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from urllib.parse import urljoin, urlparse
 import re
 
@@ -42,6 +53,322 @@ from pydantic import BaseModel, Field
 
 from src.config.settings import get_settings
 
+try:
+    import h2  # enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional file-format parsers used by FileProcessorTool
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+try:
+    from PIL import Image
+    from PIL.ExifTags import TAGS
+except ImportError:
+    Image = None
+    TAGS = None
+
+
+# Whitespace runs collapsed in extracted page text, and tags whose text is dropped
+_WS_RE = re.compile(r'\s+')
+_SCRIPT_STYLE = ('script', 'style', 'noscript', 'iframe')
+
+# Largest integer power, in bits, the calculator computes (about 30k digits)
+_CALC_MAX_POW_BITS = 100_000
+
+
+def _bounded_pow(base: Any, exponent: Any, modulus: Any = None) -> Any:
+    """pow() that refuses integer results too large to compute quickly"""
+    if (
+        modulus is None
+        and isinstance(base, int)
+        and isinstance(exponent, int)
+        and exponent > 0
+        and max(abs(base).bit_length() - 1, 0) * exponent > _CALC_MAX_POW_BITS
+    ):
+        raise ValueError("Result too large")
+    return pow(base, exponent, modulus)
+
+
+# Operators and names the calculator evaluates; anything else is rejected
+_CALC_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _bounded_pow,
+}
+_CALC_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+_CALC_FUNCTIONS = {
+    'abs': abs,
+    'round': round,
+    'min': min,
+    'max': max,
+    'sum': sum,
+    'pow': _bounded_pow,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log,
+    'log10': math.log10,
+    'exp': math.exp,
+}
+_CALC_CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+# Functions that may take a literal list or tuple of numbers as an argument
+_CALC_SEQUENCE_FUNCTIONS = frozenset({'min', 'max', 'sum'})
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(expression: str) -> ast.Expression:
+    """Parse a calculator expression once; repeated expressions reuse the tree"""
+    return ast.parse(expression.strip(), mode='eval')
+
+
+def _eval_node(node: ast.AST) -> Any:
+    """Evaluate a whitelisted arithmetic expression tree"""
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float, complex):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _CALC_BINARY_OPS:
+        # Only numbers, so e.g. [1] * 10**9 cannot build a huge list
+        left, right = _eval_number(node.left), _eval_number(node.right)
+        return _CALC_BINARY_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _CALC_UNARY_OPS:
+        return _CALC_UNARY_OPS[type(node.op)](_eval_number(node.operand))
+    if isinstance(node, ast.Name) and node.id in _CALC_CONSTANTS:
+        return _CALC_CONSTANTS[node.id]
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _CALC_FUNCTIONS
+    ):
+        if node.func.id in _CALC_SEQUENCE_FUNCTIONS:
+            args = [_eval_argument(arg) for arg in node.args]
+        else:
+            args = [_eval_node(arg) for arg in node.args]
+        kwargs = {keyword.arg: _eval_node(keyword.value) for keyword in node.keywords if keyword.arg}
+        if len(kwargs) != len(node.keywords):
+            raise ValueError("Argument unpacking not allowed")
+        return _CALC_FUNCTIONS[node.func.id](*args, **kwargs)
+    
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        raise ValueError(f"Function '{node.func.id}' not allowed")
+    name = node.id if isinstance(node, ast.Name) else type(node).__name__
+    raise ValueError(f"Operation '{name}' not allowed")
+
+
+def _eval_number(node: ast.AST) -> Any:
+    """Evaluate a node that must produce a number"""
+    value = _eval_node(node)
+    if not isinstance(value, (int, float, complex)):
+        raise ValueError(f"Operation on '{type(value).__name__}' not allowed")
+    return value
+
+
+def _eval_argument(node: ast.AST) -> Any:
+    """Evaluate a min/max/sum argument, which may be a literal list of numbers"""
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_eval_number(element) for element in node.elts]
+    return _eval_node(node)
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_extension(file_path: str) -> str:
+    """Lowercase extension of a path (the whole path when it has no dot)"""
+    return file_path.rpartition('.')[2].lower()
+
+
+# Redirect hops followed before a request gives up
+_MAX_REDIRECTS = 5
+
+# Builtins and modules visible to code run by CodeExecutorTool
+_SANDBOX_BUILTINS = {
+    'print': print,
+    'len': len,
+    'range': range,
+    'list': list,
+    'dict': dict,
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': bool,
+    'sum': sum,
+    'min': min,
+    'max': max,
+    'abs': abs,
+    'round': round
+}
+# Modules are exposed as namespaces of their public names only, so no module
+# object (and no module globals) is reachable from sandboxed code
+_SANDBOX_MODULES = {
+    'math': types.SimpleNamespace(**{name: getattr(math, name) for name in dir(math) if not name.startswith('_')})
+}
+
+# Names sandboxed code may not reference even if it defines them itself
+_SANDBOX_BLOCKED_NAMES = frozenset({
+    'exec', 'eval', 'open', 'compile', 'globals', 'locals', 'vars', 'getattr', 'setattr',
+    'delattr', 'breakpoint', 'input', 'file', 'os', 'sys', 'subprocess', 'socket', 'urllib',
+    'requests'
+})
+
+# Attributes that expose frames, code or tracebacks (generator, coroutine and
+# async generator frames lead back to the caller's module globals) or that
+# perform attribute lookups from a string (str.format)
+_SANDBOX_BLOCKED_ATTR_PREFIXES = ('_', 'gi_', 'cr_', 'ag_', 'f_', 'tb_', 'co_')
+_SANDBOX_BLOCKED_ATTRS = frozenset({'format', 'format_map', 'mro'})
+
+
+class _SandboxViolation(Exception):
+    """Raised when sandboxed code uses a disallowed construct"""
+
+
+class _SandboxValidator(ast.NodeVisitor):
+    """
+    Reject imports, private and introspection attributes, dunder names and
+    strings, and blocked builtins
+    
+    This is a denylist over the syntax tree; it narrows what snippets can
+    reach but is not an isolation boundary, so untrusted code should still
+    run in a separate process or container.
+    """
+    
+    def visit_Import(self, node: ast.Import):
+        raise _SandboxViolation(f"import {node.names[0].name}")
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        raise _SandboxViolation(f"import {node.module or '.'}")
+    
+    def visit_Attribute(self, node: ast.Attribute):
+        if node.attr.startswith(_SANDBOX_BLOCKED_ATTR_PREFIXES) or node.attr in _SANDBOX_BLOCKED_ATTRS:
+            raise _SandboxViolation(node.attr)
+        self.generic_visit(node)
+    
+    def visit_Name(self, node: ast.Name):
+        if node.id.startswith('__') or node.id in _SANDBOX_BLOCKED_NAMES:
+            raise _SandboxViolation(node.id)
+    
+    def visit_Constant(self, node: ast.Constant):
+        # Dunder keys such as ['__builtins__'] or ['__globals__']
+        value = node.value
+        if isinstance(value, bytes):
+            value = value.decode('latin-1')
+        if isinstance(value, str) and '__' in value:
+            raise _SandboxViolation(repr(node.value))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_sandboxed(code: str) -> types.CodeType:
+    """Validate and compile sandboxed code once; repeated snippets reuse the code object"""
+    tree = ast.parse(code, '<sandbox>', 'exec')
+    _SandboxValidator().visit(tree)
+    return compile(tree, '<sandbox>', 'exec')
+
+# Pooled clients shared by every WebSearchTool with the same user agent and timeout
+_SHARED_CLIENTS: Dict[Tuple[str, int], httpx.AsyncClient] = {}
+
+
+# Client private to the current synchronous call; see WebSearchTool._run
+_CALL_CLIENT: ContextVar[Optional[httpx.AsyncClient]] = ContextVar("web_search_call_client", default=None)
+
+
+def _new_client(user_agent: str, timeout: int) -> httpx.AsyncClient:
+    """Create an HTTP client configured for web search and page fetches"""
+    return httpx.AsyncClient(
+        headers={"User-Agent": user_agent},
+        timeout=httpx.Timeout(timeout, connect=5.0),
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+        http2=h2 is not None
+    )
+
+
+def _get_client(user_agent: str, timeout: int) -> httpx.AsyncClient:
+    """Get the shared HTTP client for a user agent and timeout, creating it on first use"""
+    key = (user_agent, timeout)
+    client = _SHARED_CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = _SHARED_CLIENTS[key] = _new_client(user_agent, timeout)
+    return client
+
+
+async def _ensure_public_url(url: httpx.URL) -> None:
+    """
+    Reject URLs that are not http(s) or whose host resolves to a non-public address
+    
+    The connection itself resolves the host again, so a DNS server that
+    answers differently the second time (DNS rebinding) can still steer a
+    request to an internal address. Deployments that fetch untrusted URLs
+    should also block internal ranges at the network level, e.g. with an
+    egress proxy or firewall rules.
+    """
+    if url.scheme not in ("http", "https"):
+        raise ValueError(f"unsupported URL scheme '{url.scheme}'")
+    if not url.host:
+        raise ValueError("URL has no host")
+    
+    port = url.port or (443 if url.scheme == "https" else 80)
+    addresses = await asyncio.get_running_loop().getaddrinfo(url.host, port, type=socket.SOCK_STREAM)
+    for *_, sockaddr in addresses:
+        if not ipaddress.ip_address(sockaddr[0].split('%', 1)[0]).is_global:
+            raise ValueError(f"refusing to fetch non-public address for host '{url.host}'")
+
+
+@asynccontextmanager
+async def _open_following_redirects(
+    client: httpx.AsyncClient,
+    url: httpx.URL,
+    check_first: bool = True
+) -> AsyncIterator[httpx.Response]:
+    """
+    Stream a GET response, following redirects manually
+    
+    Every redirect target must resolve to a public address; ``check_first``
+    also applies the check to ``url`` itself, for URLs from untrusted input.
+    """
+    for hop in range(_MAX_REDIRECTS + 1):
+        if hop or check_first:
+            await _ensure_public_url(url)
+        response = await client.send(client.build_request("GET", url), stream=True)
+        if not response.has_redirect_location:
+            try:
+                yield response
+            finally:
+                await response.aclose()
+            return
+        await response.aclose()
+        url = url.join(response.headers["location"])
+    raise ValueError(f"too many redirects (more than {_MAX_REDIRECTS})")
+
+
+async def close_shared_clients():
+    """Close the pooled HTTP clients (call on application shutdown)"""
+    clients = list(_SHARED_CLIENTS.values())
+    _SHARED_CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
 
 class SearchResult(BaseModel):
     """Structured search result"""
@@ -59,9 +386,10 @@ class WebSearchConfig(BaseModel):
     max_results: int = 10
     timeout: int = 30
     cache_ttl: int = 3600  # Cache TTL in seconds
+    cache_max_entries: int = 1024
     user_agent: str = "Mozilla/5.0 (compatible; AI-Agent/1.0)"
     max_content_length: int = 50000
-    extract_content: bool = True
+    extract_content: bool = False  # Fetch page content for DuckDuckGo results
 
 
 class WebSearchTool(BaseTool):
@@ -76,19 +404,31 @@ class WebSearchTool(BaseTool):
         super().__init__()
         self.config = config or WebSearchConfig()
         self.settings = get_settings()
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        # (query, max_results, engine) -> (stored_at, results), least recently used first
+        self.cache: "OrderedDict[Tuple[str, int, str], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
         
-        # HTTP client with proper headers
-        self.client = httpx.AsyncClient(
-            headers={"User-Agent": self.config.user_agent},
-            timeout=self.config.timeout,
-            follow_redirects=True
-        )
+        # Shared pooled client, so connections and TLS sessions are reused
+        # across tool instances
+        self.client = _get_client(self.config.user_agent, self.config.timeout)
     
     def _run(self, query: str, max_results: int = None) -> List[Dict[str, Any]]:
         """Synchronous search (not recommended, use arun instead)"""
-        import asyncio
-        return asyncio.run(self.arun(query, max_results))
+        return asyncio.run(self._arun_with_private_client(query, max_results))
+    
+    async def _arun_with_private_client(self, query: str, max_results: int = None) -> List[Dict[str, Any]]:
+        """
+        Search with a client that lives only as long as this call
+        
+        Each asyncio.run() call gets a new event loop, and the shared client's
+        pooled connections are bound to the loop that opened them.
+        """
+        async with _new_client(self.config.user_agent, self.config.timeout) as client:
+            _CALL_CLIENT.set(client)
+            return await self.arun(query, max_results)
+    
+    def _current_client(self) -> httpx.AsyncClient:
+        """The client for this call: a per-call one on the sync path, else the shared one"""
+        return _CALL_CLIENT.get() or self.client
     
     async def _arun(self, query: str, max_results: int = None) -> List[Dict[str, Any]]:
         """Perform web search"""
@@ -96,10 +436,12 @@ class WebSearchTool(BaseTool):
         
         # Check cache first
         cache_key = self._get_cache_key(query, max_results)
-        if cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if datetime.now() - cache_entry["timestamp"] < timedelta(seconds=self.config.cache_ttl):
-                return cache_entry["results"]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self.config.cache_ttl:
+                self.cache.move_to_end(cache_key)
+                return cached[1]
+            del self.cache[cache_key]
         
         # Perform search
         try:
@@ -110,19 +452,34 @@ class WebSearchTool(BaseTool):
             else:
                 results = await self._search_duckduckgo(query, max_results)  # Fallback
             
-            # Cache results
-            self.cache[cache_key] = {
-                "results": results,
-                "timestamp": datetime.now()
-            }
+            # Cache results, evicting the least recently used beyond the bound
+            self.cache[cache_key] = (time.monotonic(), results)
+            self.cache.move_to_end(cache_key)
+            while len(self.cache) > self.config.cache_max_entries:
+                self.cache.popitem(last=False)
             
             return results
             
         except Exception as e:
             return [{"error": f"Search failed: {str(e)}"}]
     
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET a search endpoint; redirects are followed only to public addresses"""
+        async with _open_following_redirects(
+            self._current_client(), httpx.URL(url, params=params), check_first=False
+        ) as response:
+            await response.aread()
+            return response
+    
     async def _search_duckduckgo(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search using DuckDuckGo"""
+        results = await self._search_duckduckgo_api(query, max_results)
+        if self.config.extract_content:
+            await self._attach_page_content(results)
+        return results
+    
+    async def _search_duckduckgo_api(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Search using the DuckDuckGo Instant Answer API, falling back to scraping"""
         # DuckDuckGo Instant Answer API
         search_url = "https://api.duckduckgo.com/"
         params = {
@@ -133,18 +490,19 @@ class WebSearchTool(BaseTool):
         }
         
         try:
-            response = await self.client.get(search_url, params=params)
+            response = await self._get(search_url, params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson is not None else response.json()
             
             results = []
             
             # Process instant answer
-            if data.get("AbstractText"):
+            abstract = data.get("AbstractText")
+            if abstract:
                 results.append({
                     "title": data.get("Heading", query),
                     "url": data.get("AbstractURL", ""),
-                    "snippet": data.get("AbstractText", ""),
+                    "snippet": abstract,
                     "rank": 1,
                     "source": "duckduckgo_instant"
                 })
@@ -152,10 +510,11 @@ class WebSearchTool(BaseTool):
             # Process related topics
             for i, topic in enumerate(data.get("RelatedTopics", [])[:max_results]):
                 if isinstance(topic, dict) and "Text" in topic:
+                    text = topic["Text"] or ""
                     results.append({
-                        "title": topic.get("Text", "")[:100],
+                        "title": text[:100],
                         "url": topic.get("FirstURL", ""),
-                        "snippet": topic.get("Text", ""),
+                        "snippet": text,
                         "rank": i + 2,
                         "source": "duckduckgo_related"
                     })
@@ -172,14 +531,17 @@ class WebSearchTool(BaseTool):
     
     async def _search_duckduckgo_web(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search DuckDuckGo web results by scraping"""
-        search_url = "https://duckduckgo.com/html/"
+        search_url = "https://html.duckduckgo.com/html/"
         params = {"q": query}
         
         try:
-            response = await self.client.get(search_url, params=params)
+            response = await self._get(search_url, params)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Only the results block is needed, so skip the page header
+            html = response.text
+            start = html.find('<div class="results"')
+            soup = BeautifulSoup(html[start:] if start > 0 else html, 'lxml')
             results = []
             
             # Parse search results
@@ -222,7 +584,7 @@ class WebSearchTool(BaseTool):
         }
         
         try:
-            response = await self.client.get(search_url, params=params)
+            response = await self._get(search_url, params)
             response.raise_for_status()
             data = response.json()
             
@@ -242,25 +604,46 @@ class WebSearchTool(BaseTool):
             raise Exception(f"Google search failed: {e}")
     
     async def get_page_content(self, url: str) -> Dict[str, Any]:
-        """Extract content from a web page"""
+        """
+        Extract content from a web page
+        
+        The body is streamed and reading stops after max_content_length * 4
+        bytes, so very large pages are never downloaded in full. Every hop,
+        including the first, must resolve to a public address.
+        """
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
+            async with _open_following_redirects(self._current_client(), httpx.URL(url)) as response:
+                response.raise_for_status()
+                
+                content_type = response.headers.get("content-type", "")
+                if content_type and "html" not in content_type and not content_type.startswith("text/"):
+                    raise ValueError(f"unsupported content type '{content_type}'")
+                
+                byte_limit = self.config.max_content_length * 4
+                chunks = []
+                received = 0
+                async for chunk in response.aiter_bytes(65536):
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= byte_limit:
+                        break
+                encoding = response.charset_encoding or "utf-8"
+            
+            body = b"".join(chunks)
+            try:
+                html = body.decode(encoding, errors="replace")
+            except LookupError:
+                html = body.decode("utf-8", errors="replace")
             
             # Parse HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Remove script and style elements
-            for script in soup(["script", "style"]):
+            for script in soup(_SCRIPT_STYLE):
                 script.decompose()
             
-            # Extract text content
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            # Extract text content with whitespace collapsed in one pass
+            text = _WS_RE.sub(' ', soup.get_text(' ')).strip()
             
             # Limit content length
             if len(text) > self.config.max_content_length:
@@ -291,14 +674,38 @@ class WebSearchTool(BaseTool):
                 "extracted_at": datetime.now().isoformat()
             }
     
-    def _get_cache_key(self, query: str, max_results: int) -> str:
+    async def get_page_contents(self, urls: List[str], concurrency: int = 10) -> List[Any]:
+        """Extract content from several pages concurrently, in the order of ``urls``"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _fetch(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_page_content(url)
+        
+        return await asyncio.gather(*(_fetch(url) for url in urls), return_exceptions=True)
+    
+    async def _attach_page_content(self, results: List[Dict[str, Any]]):
+        """Fetch page content for search results concurrently and attach it in place"""
+        targets = [result for result in results if result.get("url")]
+        pages = await self.get_page_contents([result["url"] for result in targets])
+        for result, page in zip(targets, pages):
+            if isinstance(page, dict) and "content" in page:
+                result["content"] = page["content"]
+    
+    def _get_cache_key(self, query: str, max_results: int) -> Tuple[str, int, str]:
         """Generate cache key for search query"""
-        key_data = f"{query}:{max_results}:{self.config.default_engine}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return (query, max_results, self.config.default_engine)
+    
+    def invalidate(self, query: Optional[str] = None):
+        """Drop cached results for a query, or the whole cache when no query is given"""
+        if query is None:
+            self.cache.clear()
+            return
+        for key in [key for key in self.cache if key[0] == query]:
+            del self.cache[key]
     
     async def cleanup(self):
-        """Cleanup resources"""
-        await self.client.aclose()
+        """Cleanup resources (the HTTP client is shared; see close_shared_clients)"""
 
 
 class FileProcessorTool(BaseTool):
@@ -315,7 +722,6 @@ class FileProcessorTool(BaseTool):
     
     def _run(self, file_path: str, file_type: str = None) -> Dict[str, Any]:
         """Synchronous file processing"""
-        import asyncio
         return asyncio.run(self.arun(file_path, file_type))
     
     async def _arun(self, file_path: str, file_type: str = None) -> Dict[str, Any]:
@@ -340,21 +746,40 @@ class FileProcessorTool(BaseTool):
     
     def _detect_file_type(self, file_path: str) -> str:
         """Detect file type from extension"""
-        extension = file_path.lower().split('.')[-1]
-        return extension
+        return _detect_extension(file_path)
     
+    # Parsing is blocking and CPU-heavy, so each format runs off the event loop
     async def _process_pdf(self, file_path: str) -> Dict[str, Any]:
+        """Process PDF file in a worker thread"""
+        return await asyncio.to_thread(self._process_pdf_sync, file_path)
+    
+    async def _process_docx(self, file_path: str) -> Dict[str, Any]:
+        """Process DOCX file in a worker thread"""
+        return await asyncio.to_thread(self._process_docx_sync, file_path)
+    
+    async def _process_text(self, file_path: str) -> Dict[str, Any]:
+        """Process text file in a worker thread"""
+        return await asyncio.to_thread(self._process_text_sync, file_path)
+    
+    async def _process_image(self, file_path: str) -> Dict[str, Any]:
+        """Process image file (extract metadata) in a worker thread"""
+        return await asyncio.to_thread(self._process_image_sync, file_path)
+    
+    def _process_pdf_sync(self, file_path: str) -> Dict[str, Any]:
         """Process PDF file"""
+        if PyPDF2 is None:
+            return {"error": "PyPDF2 not installed. Install with: pip install PyPDF2"}
+        
         try:
-            import PyPDF2
-            
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                text_content = ""
+                parts = []
                 
                 for page_num, page in enumerate(pdf_reader.pages):
-                    text_content += f"\n--- Page {page_num + 1} ---\n"
-                    text_content += page.extract_text()
+                    parts.append(f"\n--- Page {page_num + 1} ---\n")
+                    parts.append(page.extract_text() or "")
+                
+                text_content = "".join(parts)
                 
                 return {
                     "file_path": file_path,
@@ -365,21 +790,17 @@ class FileProcessorTool(BaseTool):
                     "processed_at": datetime.now().isoformat()
                 }
                 
-        except ImportError:
-            return {"error": "PyPDF2 not installed. Install with: pip install PyPDF2"}
         except Exception as e:
             return {"error": f"PDF processing failed: {str(e)}"}
     
-    async def _process_docx(self, file_path: str) -> Dict[str, Any]:
+    def _process_docx_sync(self, file_path: str) -> Dict[str, Any]:
         """Process DOCX file"""
+        if Document is None:
+            return {"error": "python-docx not installed. Install with: pip install python-docx"}
+        
         try:
-            from docx import Document
-            
             doc = Document(file_path)
-            text_content = ""
-            
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
+            text_content = "\n".join(paragraph.text for paragraph in doc.paragraphs)
             
             return {
                 "file_path": file_path,
@@ -390,12 +811,10 @@ class FileProcessorTool(BaseTool):
                 "processed_at": datetime.now().isoformat()
             }
             
-        except ImportError:
-            return {"error": "python-docx not installed. Install with: pip install python-docx"}
         except Exception as e:
             return {"error": f"DOCX processing failed: {str(e)}"}
     
-    async def _process_text(self, file_path: str) -> Dict[str, Any]:
+    def _process_text_sync(self, file_path: str) -> Dict[str, Any]:
         """Process text file"""
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
@@ -413,12 +832,12 @@ class FileProcessorTool(BaseTool):
         except Exception as e:
             return {"error": f"Text file processing failed: {str(e)}"}
     
-    async def _process_image(self, file_path: str) -> Dict[str, Any]:
+    def _process_image_sync(self, file_path: str) -> Dict[str, Any]:
         """Process image file (extract metadata)"""
+        if Image is None:
+            return {"error": "Pillow not installed. Install with: pip install Pillow"}
+        
         try:
-            from PIL import Image
-            from PIL.ExifTags import TAGS
-            
             with Image.open(file_path) as img:
                 # Basic image info
                 info = {
@@ -445,8 +864,6 @@ class FileProcessorTool(BaseTool):
                 
                 return info
                 
-        except ImportError:
-            return {"error": "Pillow not installed. Install with: pip install Pillow"}
         except Exception as e:
             return {"error": f"Image processing failed: {str(e)}"}
 
@@ -470,38 +887,9 @@ class CalculatorTool(BaseTool):
     def _safe_eval(self, expression: str) -> Dict[str, Any]:
         """Safely evaluate mathematical expressions"""
         try:
-            # Remove any dangerous functions/imports
-            dangerous = [
-                'import', 'exec', 'eval', 'open', 'file', 'input', 
-                'raw_input', '__import__', '__builtins__'
-            ]
-            
-            for danger in dangerous:
-                if danger in expression.lower():
-                    return {"error": f"Dangerous operation '{danger}' not allowed"}
-            
-            # Only allow safe mathematical operations
-            allowed_names = {
-                k: v for k, v in __builtins__.items() 
-                if k in ['abs', 'round', 'min', 'max', 'sum', 'pow']
-            }
-            
-            # Add math functions
-            import math
-            allowed_names.update({
-                'sqrt': math.sqrt,
-                'sin': math.sin,
-                'cos': math.cos,
-                'tan': math.tan,
-                'log': math.log,
-                'log10': math.log10,
-                'exp': math.exp,
-                'pi': math.pi,
-                'e': math.e
-            })
-            
-            # Evaluate expression
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
+            # Walk the parsed tree instead of eval(), so only arithmetic and
+            # the whitelisted functions and constants can run
+            result = _eval_node(_parse_expression(expression))
             
             return {
                 "expression": expression,
@@ -531,7 +919,6 @@ class CodeExecutorTool(BaseTool):
     
     def _run(self, code: str, language: str = "python") -> Dict[str, Any]:
         """Execute code synchronously"""
-        import asyncio
         return asyncio.run(self.arun(code, language))
     
     async def _arun(self, code: str, language: str = "python") -> Dict[str, Any]:
@@ -547,52 +934,26 @@ class CodeExecutorTool(BaseTool):
     async def _execute_python(self, code: str) -> Dict[str, Any]:
         """Execute Python code safely"""
         try:
-            # Basic safety checks
-            dangerous_imports = [
-                'os', 'sys', 'subprocess', 'socket', 'urllib', 'requests',
-                'file', 'open', 'exec', 'eval', '__import__'
-            ]
-            
-            code_lower = code.lower()
-            for danger in dangerous_imports:
-                if danger in code_lower:
-                    return {"error": f"Dangerous operation '{danger}' not allowed"}
+            # Check the syntax tree rather than the raw text, so innocent
+            # names that merely contain a blocked word still pass
+            try:
+                compiled = _compile_sandboxed(code)
+            except _SandboxViolation as e:
+                return {"error": f"Dangerous operation '{e}' not allowed"}
             
             # Capture output
-            import io
-            import contextlib
-            from contextlib import redirect_stdout, redirect_stderr
-            
             stdout_buffer = io.StringIO()
             stderr_buffer = io.StringIO()
             
             # Execute with output capture
             with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-                # Create restricted environment
-                restricted_globals = {
-                    '__builtins__': {
-                        'print': print,
-                        'len': len,
-                        'range': range,
-                        'list': list,
-                        'dict': dict,
-                        'str': str,
-                        'int': int,
-                        'float': float,
-                        'bool': bool,
-                        'sum': sum,
-                        'min': min,
-                        'max': max,
-                        'abs': abs,
-                        'round': round
-                    }
-                }
+                # Create restricted environment (fresh dicts, so one run
+                # cannot leak names into the next). __builtins__ is a plain
+                # dict of the whitelisted callables, never the builtins module,
+                # so frames of sandboxed code see nothing else
+                restricted_globals = {'__builtins__': dict(_SANDBOX_BUILTINS), **_SANDBOX_MODULES}
                 
-                # Add safe math module
-                import math
-                restricted_globals['math'] = math
-                
-                exec(code, restricted_globals)
+                exec(compiled, restricted_globals)
             
             stdout_value = stdout_buffer.getvalue()
             stderr_value = stderr_buffer.getvalue()
@@ -625,20 +986,35 @@ AVAILABLE_TOOLS = {
 }
 
 
+# Default-configured tools, created on first request and shared process-wide
+_TOOL_INSTANCES: Dict[str, BaseTool] = {}
+
+
 def get_tool(tool_name: str, **kwargs) -> BaseTool:
-    """Get a tool instance by name"""
+    """
+    Get a tool instance by name
+    
+    Without kwargs the tool is created on first use and the same instance is
+    returned afterwards; kwargs always build a new, unshared instance.
+    """
     if tool_name not in AVAILABLE_TOOLS:
         raise ValueError(f"Tool '{tool_name}' not found. Available tools: {list(AVAILABLE_TOOLS.keys())}")
     
-    return AVAILABLE_TOOLS[tool_name](**kwargs)
+    if kwargs:
+        return AVAILABLE_TOOLS[tool_name](**kwargs)
+    
+    tool = _TOOL_INSTANCES.get(tool_name)
+    if tool is None:
+        tool = _TOOL_INSTANCES[tool_name] = AVAILABLE_TOOLS[tool_name]()
+    return tool
 
 
 def get_all_tools(**kwargs) -> List[BaseTool]:
     """Get all available tools"""
     tools = []
-    for tool_class in AVAILABLE_TOOLS.values():
+    for tool_name, tool_class in AVAILABLE_TOOLS.items():
         try:
-            tools.append(tool_class(**kwargs))
+            tools.append(get_tool(tool_name, **kwargs))
         except Exception as e:
             print(f"Warning: Could not initialize tool {tool_class.__name__}: {e}")
     
@@ -1,42 +1,92 @@
 """
 Utility functions for file handling
 """
+import functools
 import os
 import hashlib
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any, FrozenSet, Iterable, Tuple, Union
 from datetime import datetime
 
+import aiofiles
 from loguru import logger
 
 from src.config.settings import get_settings
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Characters replaced by sanitize_filename ('..' is handled separately)
+_FILENAME_TRANSLATION = str.maketrans({char: '_' for char in '/\\<>:"|?*'})
+
+# Read size for hashing on Pythons without hashlib.file_digest
+_HASH_BLOCK_SIZE = 1 << 20
+
+# Chunk size when copying a streamed upload to disk
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 def ensure_directory_exists(directory_path: str) -> None:
     """Ensure a directory exists, create it if it doesn't"""
     Path(directory_path).mkdir(parents=True, exist_ok=True)
 
 
-def get_file_hash(file_path: str) -> Optional[str]:
-    """Get MD5 hash of a file"""
+def _new_hash(algorithm: str):
+    """Create a hash object; "blake2b" is a 16-byte BLAKE2b digest"""
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    if algorithm == "xxh3_64":
+        if xxhash is None:
+            raise ValueError("xxhash not installed. Install with: pip install xxhash")
+        return xxhash.xxh3_64()
+    return hashlib.new(algorithm)
+
+
+def get_file_hash(file_path: str, algorithm: str = "blake2b") -> Optional[str]:
+    """
+    Get a content hash of a file
+    
+    Defaults to a 16-byte BLAKE2b digest (the same one save_uploaded_file
+    records). Use "xxh3_64" for faster non-cryptographic fingerprints, or
+    any hashlib algorithm name.
+    """
     try:
         with open(file_path, 'rb') as f:
-            file_hash = hashlib.md5()
-            for chunk in iter(lambda: f.read(4096), b""):
-                file_hash.update(chunk)
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, lambda: _new_hash(algorithm)).hexdigest()
+            
+            file_hash = _new_hash(algorithm)
+            buffer = memoryview(bytearray(_HASH_BLOCK_SIZE))
+            while size := f.readinto(buffer):
+                file_hash.update(buffer[:size])
             return file_hash.hexdigest()
     except Exception as e:
         logger.error(f"Failed to get file hash: {str(e)}")
         return None
 
 
-def validate_file_extension(filename: str, allowed_extensions: List[str]) -> bool:
-    """Check if file extension is allowed"""
+@functools.lru_cache(maxsize=64)
+def _lowered_extensions(allowed_extensions: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(ext.lower() for ext in allowed_extensions)
+
+
+def validate_file_extension(filename: str, allowed_extensions: Iterable[str]) -> bool:
+    """
+    Check if file extension is allowed
+    
+    Hot paths can pass a frozenset of lowercase extensions to skip
+    normalizing the allowed list on every call.
+    """
     if not filename:
         return False
     
-    extension = filename.lower().split('.')[-1] if '.' in filename else ''
-    return extension in [ext.lower() for ext in allowed_extensions]
+    if not isinstance(allowed_extensions, frozenset):
+        allowed_extensions = _lowered_extensions(tuple(allowed_extensions))
+    
+    _, sep, extension = filename.rpartition('.')
+    return (extension.lower() if sep else '') in allowed_extensions
 
 
 def get_file_size_mb(file_path: str) -> float:
@@ -51,22 +101,11 @@ def get_file_size_mb(file_path: str) -> float:
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to remove potentially dangerous characters"""
     # Remove path separators and other potentially dangerous characters
-    dangerous_chars = ['/', '\\', '..', '<', '>', ':', '"', '|', '?', '*']
-    
-    sanitized = filename
-    for char in dangerous_chars:
-        sanitized = sanitized.replace(char, '_')
-    
-    return sanitized
+    return filename.translate(_FILENAME_TRANSLATION).replace('..', '_')
 
 
-def save_uploaded_file(file_content: bytes, filename: str, upload_dir: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Save uploaded file to disk
-    
-    Returns:
-        Dictionary with file information including path, size, hash, etc.
-    """
+def _upload_path(filename: str, upload_dir: Optional[str]) -> Tuple[str, str]:
+    """Pick the saved name and full path for an upload"""
     settings = get_settings()
     upload_directory = upload_dir or settings.upload_dir
     
@@ -82,35 +121,95 @@ def save_uploaded_file(file_content: bytes, filename: str, upload_dir: Optional[
     unique_filename = f"{name}_{timestamp}{ext}"
     
     # Full file path
-    file_path = os.path.join(upload_directory, unique_filename)
+    return unique_filename, os.path.join(upload_directory, unique_filename)
+
+
+def _upload_info(filename: str, unique_filename: str, file_path: str, size_bytes: int, file_hash) -> Dict[str, Any]:
+    """Build the result of a successful upload save"""
+    file_info = {
+        'original_filename': filename,
+        'saved_filename': unique_filename,
+        'file_path': file_path,
+        'size_bytes': size_bytes,
+        'size_mb': size_bytes / (1024 * 1024),
+        'hash': file_hash.hexdigest(),
+        'upload_time': datetime.now(),
+        'success': True
+    }
+    
+    logger.info(f"File saved successfully: {unique_filename} ({file_info['size_mb']:.2f} MB)")
+    return file_info
+
+
+def _upload_failure(filename: str, error: Exception) -> Dict[str, Any]:
+    logger.error(f"Failed to save file {filename}: {str(error)}")
+    return {
+        'original_filename': filename,
+        'error': str(error),
+        'success': False
+    }
+
+
+def save_uploaded_file(file_content: bytes, filename: str, upload_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Save uploaded file to disk
+    
+    Blocking; async callers should use ``asave_uploaded_file``.
+    
+    Returns:
+        Dictionary with file information including path, size, hash, etc.
+    """
+    unique_filename, file_path = _upload_path(filename, upload_dir)
     
     try:
         # Save file
         with open(file_path, 'wb') as f:
             f.write(file_content)
         
-        # Get file information
-        file_info = {
-            'original_filename': filename,
-            'saved_filename': unique_filename,
-            'file_path': file_path,
-            'size_bytes': len(file_content),
-            'size_mb': len(file_content) / (1024 * 1024),
-            'hash': hashlib.md5(file_content).hexdigest(),
-            'upload_time': datetime.now(),
-            'success': True
-        }
+        file_hash = _new_hash("blake2b")
+        file_hash.update(file_content)
+        return _upload_info(filename, unique_filename, file_path, len(file_content), file_hash)
+        
+    except Exception as e:
+        return _upload_failure(filename, e)
+
+
+async def asave_uploaded_file(
+    file_content: Union[bytes, Any],
+    filename: str,
+    upload_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Save uploaded file to disk without blocking the event loop
+    
+    ``file_content`` is either the raw bytes or an upload with an async
+    ``read(size)`` (such as FastAPI's UploadFile), which is hashed and written
+    chunk by chunk without holding the whole file in memory.
+    
+    Returns:
+        Dictionary with file information including path, size, hash, etc.
+    """
+    unique_filename, file_path = _upload_path(filename, upload_dir)
+    
+    try:
+        # Save file, hashing the same buffers as they are written
+        file_hash = _new_hash("blake2b")
+        size_bytes = 0
+        async with aiofiles.open(file_path, 'wb') as f:
+            if isinstance(file_content, (bytes, bytearray)):
+                file_hash.update(file_content)
+                size_bytes = len(file_content)
+                await f.write(file_content)
+            else:
+                while chunk := await file_content.read(_UPLOAD_CHUNK_SIZE):
+                    file_hash.update(chunk)
+                    size_bytes += len(chunk)
+                    await f.write(chunk)
         
-        logger.info(f"File saved successfully: {unique_filename} ({file_info['size_mb']:.2f} MB)")
-        return file_info
+        return _upload_info(filename, unique_filename, file_path, size_bytes, file_hash)
         
     except Exception as e:
-        logger.error(f"Failed to save file {filename}: {str(e)}")
-        return {
-            'original_filename': filename,
-            'error': str(e),
-            'success': False
-        }
+        return _upload_failure(filename, e)
 
 
 def cleanup_old_files(directory: str, max_age_days: int = 7) -> int:
@@ -120,47 +219,56 @@ def cleanup_old_files(directory: str, max_age_days: int = 7) -> int:
     Returns:
         Number of files deleted
     """
-    if not os.path.exists(directory):
-        return 0
-    
     deleted_count = 0
     cutoff_time = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
     
     try:
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
-            
-            if os.path.isfile(file_path):
-                file_mtime = os.path.getmtime(file_path)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
                 
-                if file_mtime < cutoff_time:
-                    os.remove(file_path)
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        continue
                     deleted_count += 1
-                    logger.info(f"Deleted old file: {filename}")
         
         logger.info(f"Cleanup complete: {deleted_count} files deleted from {directory}")
         return deleted_count
-        
+    
+    except FileNotFoundError:
+        # Nothing to clean; scandir doubles as the existence check
+        return 0
     except Exception as e:
         logger.error(f"Failed to cleanup files in {directory}: {str(e)}")
         return 0
 
 
+def _scan_directory(directory: str) -> Tuple[int, int]:
+    """Total size and count of regular files under a directory, without following symlinks"""
+    total_size = 0
+    file_count = 0
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                    file_count += 1
+                elif entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+    return total_size, file_count
+
+
 def get_directory_size(directory: str) -> Dict[str, Any]:
     """Get total size and file count of a directory"""
     if not os.path.exists(directory):
         return {'size_bytes': 0, 'size_mb': 0, 'file_count': 0}
     
-    total_size = 0
-    file_count = 0
-    
     try:
-        for dirpath, dirnames, filenames in os.walk(directory):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.exists(filepath):
-                    total_size += os.path.getsize(filepath)
-                    file_count += 1
+        total_size, file_count = _scan_directory(directory)
         
         return {
             'size_bytes': total_size,
@@ -2,11 +2,17 @@
 Test the agent registry functionality
 """
 import pytest
+import pytest_asyncio
 import asyncio
 from unittest.mock import Mock, AsyncMock
 
 from src.agents.registry.manager import AgentManager
-from src.agents.base.agent import BaseAgent
+from src.agents.base.agent import BaseAgent, AgentResponse
+
+
+# Static metadata for mock responses. AgentResponse stores the dict it is
+# given and process_message updates it, so each response gets a copy.
+_MOCK_META = {"test": True}
 
 
 class MockAgent(BaseAgent):
@@ -27,27 +33,35 @@ class MockAgent(BaseAgent):
     
     async def _process_message(self, message, session_id, context):
         """Mock message processing"""
-        from src.agents.base.agent import AgentResponse
         return AgentResponse(
             content=f"Mock response to: {message}",
-            metadata={"test": True}
+            metadata=dict(_MOCK_META)
         )
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
 async def agent_registry():
-    """Create an agent registry for testing"""
+    """Create an agent registry shared by the tests in this module"""
     registry = AgentManager()
     await registry.initialize()
-    return registry
+    yield registry
+    await registry.cleanup()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
 async def mock_agent():
-    """Create a mock agent for testing"""
+    """Create a mock agent shared by the tests in this module"""
     agent = MockAgent()
     await agent.initialize()
-    return agent
+    yield agent
+    await agent.cleanup()
+
+
+@pytest_asyncio.fixture(autouse=True, loop_scope="module")
+async def reset_registry(agent_registry, mock_agent):
+    """Unregister the mock agent after each test so the shared registry starts empty"""
+    yield
+    await agent_registry.unregister_agent(mock_agent.id)
 
 
 @pytest.mark.asyncio
@@ -57,11 +71,8 @@ async def test_agent_registry_initialization(agent_registry):
     assert agent_registry.agent_metadata == {}
 
 
-@pytest.mark.asyncio
-async def test_register_agent(agent_registry, mock_agent):
+async def check_register_agent(agent_registry, mock_agent):
     """Test manual agent registration"""
-    await agent_registry.register_agent(mock_agent)
-    
     assert mock_agent.id in agent_registry.agents
     assert mock_agent.id in agent_registry.agent_metadata
     
@@ -71,11 +82,8 @@ async def test_register_agent(agent_registry, mock_agent):
     assert agent_info["agent_type"] == "test"
 
 
-@pytest.mark.asyncio
-async def test_list_agents(agent_registry, mock_agent):
+async def check_list_agents(agent_registry, mock_agent):
     """Test listing agents"""
-    await agent_registry.register_agent(mock_agent)
-    
     agents = agent_registry.list_agents()
     assert len(agents) == 1
     assert agents[0]["id"] == mock_agent.id
@@ -88,11 +96,8 @@ async def test_list_agents(agent_registry, mock_agent):
     assert len(other_agents) == 0
 
 
-@pytest.mark.asyncio
-async def test_discover_agents(agent_registry, mock_agent):
+async def check_discover_agents(agent_registry, mock_agent):
     """Test agent discovery"""
-    await agent_registry.register_agent(mock_agent)
-    
     # Test discovery with relevant query
     results = await agent_registry.discover_agents("testing")
     assert len(results) == 1
@@ -103,11 +108,8 @@ async def test_discover_agents(agent_registry, mock_agent):
     assert len(results) == 0
 
 
-@pytest.mark.asyncio
-async def test_unregister_agent(agent_registry, mock_agent):
+async def check_unregister_agent(agent_registry, mock_agent):
     """Test agent unregistration"""
-    await agent_registry.register_agent(mock_agent)
-    
     # Verify agent is registered
     assert mock_agent.id in agent_registry.agents
     
@@ -118,11 +120,8 @@ async def test_unregister_agent(agent_registry, mock_agent):
     assert mock_agent.id not in agent_registry.agent_metadata
 
 
-@pytest.mark.asyncio
-async def test_get_agent(agent_registry, mock_agent):
+async def check_get_agent(agent_registry, mock_agent):
     """Test getting agent instance"""
-    await agent_registry.register_agent(mock_agent)
-    
     retrieved_agent = agent_registry.get_agent(mock_agent.id)
     assert retrieved_agent is mock_agent
     
@@ -130,11 +129,8 @@ async def test_get_agent(agent_registry, mock_agent):
     assert nonexistent_agent is None
 
 
-@pytest.mark.asyncio
-async def test_cleanup(agent_registry, mock_agent):
+async def check_cleanup(agent_registry, mock_agent):
     """Test registry cleanup"""
-    await agent_registry.register_agent(mock_agent)
-    
     # Verify agent is registered
     assert len(agent_registry.agents) == 1
     
@@ -143,4 +139,23 @@ async def test_cleanup(agent_registry, mock_agent):
     
     # Verify cleanup
     assert len(agent_registry.agents) == 0
-    assert len(agent_registry.agent_metadata) == 0
\ No newline at end of file
+    assert len(agent_registry.agent_metadata) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "check",
+    [
+        check_register_agent,
+        check_list_agents,
+        check_discover_agents,
+        check_unregister_agent,
+        check_get_agent,
+        check_cleanup,
+    ],
+    ids=["register", "list", "discover", "unregister", "get", "cleanup"]
+)
+async def test_registered_agent(agent_registry, mock_agent, check):
+    """Register the mock agent, then run one registry operation against it"""
+    await agent_registry.register_agent(mock_agent)
+    await check(agent_registry, mock_agent)
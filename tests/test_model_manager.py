@@ -0,0 +1,246 @@
+"""
+Test model manager resilience features
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.core.exceptions import ModelProviderException, ProviderUnavailableException
+from src.services.model_manager import CircuitBreaker, ModelManager
+
+
+class Failure(Exception):
+    """Error raised by failing calls in these tests"""
+
+
+class FakeProvider:
+    """Provider that answers with its name, or fails when asked to"""
+
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.calls = 0
+
+    async def generate_text(self, model_name, messages, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise Failure(self.name)
+        return f"{self.name}/{model_name}"
+
+
+class SlowInfoProvider:
+    """Provider whose model info lookups wait until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def get_model_info(self, model_name):
+        self.calls += 1
+        await self.release.wait()
+        return {"name": model_name}
+
+
+@pytest_asyncio.fixture
+async def manager():
+    """Model manager without configured providers; tests add fakes"""
+    model_manager = ModelManager()
+    model_manager.providers.clear()
+    yield model_manager
+    await model_manager.aclose()
+
+
+def add_provider(model_manager, name, provider, threshold=5):
+    """Register a fake provider with its breaker and concurrency limit"""
+    model_manager.providers[name] = provider
+    model_manager._breakers[name] = CircuitBreaker(name, threshold=threshold, cooldown=60)
+    model_manager._semaphores[name] = asyncio.Semaphore(4)
+    model_manager._batchers.pop(name, None)
+    return provider
+
+
+async def call(breaker, fail=False):
+    """Run one call through the breaker"""
+    async with breaker:
+        if fail:
+            raise Failure()
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_after_threshold():
+    """Consecutive failures open the breaker; calls then fail fast"""
+    breaker = CircuitBreaker("fake", threshold=2, cooldown=60)
+    for _ in range(2):
+        with pytest.raises(Failure):
+            await call(breaker, fail=True)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ProviderUnavailableException):
+        await call(breaker)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_success_resets_failures():
+    """A success between failures keeps the breaker closed"""
+    breaker = CircuitBreaker("fake", threshold=2, cooldown=60)
+    with pytest.raises(Failure):
+        await call(breaker, fail=True)
+    await call(breaker)
+    with pytest.raises(Failure):
+        await call(breaker, fail=True)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_open_allows_one_trial():
+    """After the cooldown a single trial call decides whether the breaker closes"""
+    breaker = CircuitBreaker("fake", threshold=1, cooldown=0)
+    with pytest.raises(Failure):
+        await call(breaker, fail=True)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    release = asyncio.Event()
+
+    async def trial():
+        async with breaker:
+            await release.wait()
+
+    trial_task = asyncio.create_task(trial())
+    await asyncio.sleep(0)
+    with pytest.raises(ProviderUnavailableException):
+        await call(breaker)
+
+    release.set()
+    await trial_task
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_stale_calls_do_not_decide_trial():
+    """Calls started before the breaker opened neither close it nor extend the cooldown"""
+    breaker = CircuitBreaker("fake", threshold=1, cooldown=0)
+    stale_release = asyncio.Event()
+    trial_release = asyncio.Event()
+
+    async def hold(release, fail=False):
+        async with breaker:
+            await release.wait()
+            if fail:
+                raise Failure()
+
+    stale_ok = asyncio.create_task(hold(stale_release))
+    stale_failing = asyncio.create_task(hold(stale_release, fail=True))
+    await asyncio.sleep(0)
+    with pytest.raises(Failure):
+        await call(breaker, fail=True)
+    opened_at = breaker.opened_at
+
+    trial_task = asyncio.create_task(hold(trial_release, fail=True))
+    await asyncio.sleep(0)
+    stale_release.set()
+    await stale_ok
+    with pytest.raises(Failure):
+        await stale_failing
+
+    assert breaker.opened_at == opened_at
+    with pytest.raises(ProviderUnavailableException):
+        await call(breaker)
+
+    trial_release.set()
+    with pytest.raises(Failure):
+        await trial_task
+    assert breaker.opened_at > opened_at
+    assert breaker.failure_count == 3
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_cancellation():
+    """Cancelled calls are not counted as provider failures"""
+    breaker = CircuitBreaker("fake", threshold=1, cooldown=60)
+
+    async def hang():
+        async with breaker:
+            await asyncio.Event().wait()
+
+    task = asyncio.create_task(hang())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failover_moves_to_next_candidate(manager):
+    """A failing candidate falls through to the next one for the alias"""
+    add_provider(manager, "primary", FakeProvider("primary", fail=True))
+    add_provider(manager, "backup", FakeProvider("backup"))
+    manager._aliases["smart"] = [("primary", "m1"), ("backup", "m2")]
+
+    result = await manager.generate_text_with_failover("smart", [{"role": "user", "content": "hi"}])
+
+    assert result == "backup/m2"
+
+
+@pytest.mark.asyncio
+async def test_failover_skips_open_circuits(manager):
+    """Candidates whose breaker is open are not called"""
+    primary = add_provider(manager, "primary", FakeProvider("primary", fail=True), threshold=1)
+    add_provider(manager, "backup", FakeProvider("backup"))
+    manager._aliases["smart"] = [("primary", "m1"), ("backup", "m2")]
+    messages = [{"role": "user", "content": "hi"}]
+
+    await manager.generate_text_with_failover("smart", messages)
+    await manager.generate_text_with_failover("smart", messages)
+
+    assert primary.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failover_reports_every_candidate(manager):
+    """When no candidate succeeds the error lists each attempt"""
+    add_provider(manager, "primary", FakeProvider("primary", fail=True))
+    add_provider(manager, "backup", FakeProvider("backup", fail=True))
+    manager._aliases["smart"] = [("primary", "m1"), ("backup", "m2")]
+
+    with pytest.raises(ModelProviderException) as exc_info:
+        await manager.generate_text_with_failover("smart", [])
+
+    assert "primary/m1" in str(exc_info.value)
+    assert "backup/m2" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_model_info_is_fetched_once(manager):
+    """Concurrent lookups for one model share a single provider call"""
+    provider = add_provider(manager, "slow", SlowInfoProvider())
+
+    lookups = [asyncio.create_task(manager.get_model_info("slow", "m1")) for _ in range(5)]
+    await asyncio.sleep(0)
+    provider.release.set()
+    results = await asyncio.gather(*lookups)
+
+    assert provider.calls == 1
+    assert results == [{"name": "m1"}] * 5
+    assert not manager._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_fetch(manager):
+    """Cancelling one waiter leaves the fetch running for the others"""
+    provider = add_provider(manager, "slow", SlowInfoProvider())
+
+    first = asyncio.create_task(manager.get_model_info("slow", "m1"))
+    second = asyncio.create_task(manager.get_model_info("slow", "m1"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    provider.release.set()
+
+    assert await second == {"name": "m1"}
+    assert first.cancelled()
+    assert provider.calls == 1
@@ -0,0 +1,141 @@
+"""
+Test prompt template management
+"""
+import pytest
+
+from src.prompts.manager import (
+    PromptManager,
+    PromptMetadata,
+    PromptVariable,
+    SimplePromptTemplate,
+    TemplateConfig
+)
+
+
+def make_template(template_id="greeting", text="Hello {name}", tags=None, category="general"):
+    """Create a simple template with a single ``name`` variable"""
+    metadata = PromptMetadata(
+        id=template_id,
+        name=template_id,
+        description="Template for tests",
+        tags=list(tags or []),
+        category=category,
+        variables=[PromptVariable(name="name")]
+    )
+    return SimplePromptTemplate(metadata, text)
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Create prompt managers backed by a temporary templates directory"""
+    def factory(**options):
+        return PromptManager(TemplateConfig(templates_dir=str(tmp_path), **options))
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_delete_after_register_does_not_resurrect(make_manager, tmp_path):
+    """A delete issued while the save is pending runs after it"""
+    manager = make_manager()
+    manager.register_template("greeting", make_template())
+    manager.delete_template("greeting")
+    await manager.flush()
+
+    assert not (tmp_path / "greeting.json").exists()
+    assert "greeting" not in make_manager().templates
+
+
+@pytest.mark.asyncio
+async def test_aregister_writes_snapshot(make_manager, tmp_path):
+    """The saved file reflects the template as it was registered"""
+    manager = make_manager()
+    template = make_template(tags=["a"])
+    await manager.aregister_template("greeting", template)
+    template.metadata.tags.append("b")
+
+    assert (tmp_path / "greeting.json").exists()
+    assert make_manager().get_template("greeting").metadata.tags == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_aregister_surfaces_write_errors(make_manager, tmp_path):
+    """Write failures are raised to callers waiting on the save"""
+    manager = make_manager()
+    tmp_path.rmdir()
+
+    with pytest.raises(OSError):
+        await manager.aregister_template("greeting", make_template())
+
+
+@pytest.mark.asyncio
+async def test_append_log_replays_on_reload(make_manager, tmp_path):
+    """Logged upserts and deletes are applied on top of the JSON files"""
+    manager = make_manager(append_log=True)
+    manager.register_template("kept", make_template("kept", tags=["x"]))
+    manager.register_template("dropped", make_template("dropped"))
+    manager.delete_template("dropped")
+    await manager.flush()
+    assert not (tmp_path / "kept.json").exists()
+
+    reloaded = make_manager(append_log=True)
+    assert set(reloaded.templates) == {"kept"}
+
+    await reloaded.reload_templates()
+    assert set(reloaded.templates) == {"kept"}
+    assert [m.id for m in reloaded.list_templates(tags=["x"])] == ["kept"]
+
+    reloaded.compact()
+    assert (tmp_path / "kept.json").exists()
+    assert set(make_manager().templates) == {"kept"}
+
+
+def test_filtered_listing_keeps_registration_order(make_manager):
+    """Index lookups return templates in the same order as the full listing"""
+    manager = make_manager(auto_save=False)
+    for template_id in ("zeta", "alpha", "mid"):
+        manager.register_template(template_id, make_template(template_id, tags=["t"]))
+    manager.register_template("alpha", make_template("alpha", tags=["t"]))
+
+    assert [m.id for m in manager.list_templates()] == ["zeta", "alpha", "mid"]
+    assert [m.id for m in manager.list_templates(tags=["t"])] == ["zeta", "alpha", "mid"]
+
+
+def test_update_template_refreshes_tag_index(make_manager):
+    """Metadata updates move a template between tag and category indices"""
+    manager = make_manager(auto_save=False)
+    manager.register_template("greeting", make_template(tags=["old"]))
+
+    manager.update_template("greeting", tags=["new"], category="chat")
+
+    assert manager.list_templates(tags=["old"]) == []
+    assert [m.id for m in manager.list_templates(tags=["new"], category="chat")] == ["greeting"]
+
+
+@pytest.mark.asyncio
+async def test_render_cache_is_opt_in(make_manager):
+    """Rendered prompts are only cached when a cache size is configured"""
+    manager = make_manager(auto_save=False)
+    manager.register_template("greeting", make_template())
+    assert await manager.get_prompt("greeting", {"name": "Ada"}) == "Hello Ada"
+    assert not manager._render_cache
+
+    cached = make_manager(auto_save=False, max_render_cache_size=8)
+    cached.register_template("greeting", make_template())
+    for value in (1, True, 1):
+        await cached.get_prompt("greeting", {"name": value})
+    assert len(cached._render_cache) == 2
+    assert await cached.get_prompt("greeting", {"name": True}) == "Hello True"
+    assert cached.get_template("greeting").metadata.usage_count == 4
+
+
+@pytest.mark.asyncio
+async def test_fast_format_matches_langchain(make_manager):
+    """str.format rendering gives the same text as the compiled template"""
+    template_text = "Hi {name}, {{literal}} braces"
+    default = make_manager(auto_save=False)
+    fast = make_manager(auto_save=False, fast_format=True)
+    default.register_template("t", make_template("t", template_text))
+    fast.register_template("t", make_template("t", template_text))
+
+    expected = await default.get_prompt("t", {"name": "Ada"})
+    assert await fast.get_prompt("t", {"name": "Ada"}) == expected
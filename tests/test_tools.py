@@ -0,0 +1,68 @@
+"""
+Test built-in tool safeguards
+"""
+import pytest
+
+from src.tools.base_tools import CalculatorTool, CodeExecutorTool
+
+
+GENERATOR_FRAME_ESCAPE = """
+def gen():
+    yield 1
+g = gen()
+frame = g.gi_frame.f_back
+while frame.f_back:
+    frame = frame.f_back
+frame.f_globals['__builtins__']['__import__']('os')
+"""
+
+STRING_SUBSCRIPT_ESCAPE = """
+namespace = {}
+namespace['__builtins__']
+"""
+
+
+async def run_python(code):
+    """Run code through the executor's Python sandbox"""
+    return await CodeExecutorTool.model_construct()._execute_python(code)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("code", [
+    GENERATOR_FRAME_ESCAPE,
+    STRING_SUBSCRIPT_ESCAPE,
+    "print(len.__self__)",
+    "print(('{0._' + '_class_' + '_}').format(1))",
+    "import os",
+    "os = 1",
+], ids=["generator-frame", "string-subscript", "dunder-attribute", "format-lookup", "import", "blocked-name"])
+async def test_sandbox_rejects_escapes(code):
+    """Frame walking, dunder access and blocked names never reach execution"""
+    result = await run_python(code)
+
+    assert "stdout" not in result
+    assert "not allowed" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_sandbox_runs_plain_code():
+    """Whitelisted builtins and math still work inside the sandbox"""
+    result = await run_python("print(max(range(3)), math.sqrt(16))")
+
+    assert result["success"] is True
+    assert result["stdout"] == "2 4.0\n"
+
+
+@pytest.mark.parametrize("expression", ["[1] * 10**9", "(1, 2) + (3,)", "-[1]", "sum([[1] * 10**9])"])
+def test_calculator_rejects_sequence_arithmetic(expression):
+    """Lists and tuples are only accepted as arguments to min, max and sum"""
+    result = CalculatorTool.model_construct()._safe_eval(expression)
+
+    assert "not allowed" in result["error"]
+
+
+def test_calculator_accepts_sequence_arguments():
+    """min, max and sum still take literal lists of numbers"""
+    calculator = CalculatorTool.model_construct()
+
+    assert calculator._safe_eval("sum([1, 2, 3]) + max((4, 5))")["result"] == 11
@@ -0,0 +1,258 @@
+"""
+Test multi-agent workflow execution
+"""
+import asyncio
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from src.orchestrator.workflow import MultiAgentWorkflow, WorkflowBuilder, WorkflowNode
+from src.agents.registry.manager import AgentManager
+from src.agents.base.agent import BaseAgent, AgentResponse
+
+
+class EchoAgent(BaseAgent):
+    """Agent that echoes its input, or fails when asked to"""
+
+    def __init__(self, agent_id, fail=False):
+        super().__init__(
+            agent_id=agent_id,
+            name=agent_id,
+            description="Echoes messages for workflow tests",
+            agent_type="echo",
+            capabilities=["echo"]
+        )
+        self.fail = fail
+
+    async def _initialize_agent(self):
+        pass
+
+    async def _process_message(self, message, session_id, context):
+        if self.fail:
+            raise RuntimeError(f"{self.id} failed")
+        return AgentResponse(content=f"{self.id}: {message}")
+
+
+class Rendezvous:
+    """Releases its waiters once the expected number of them have arrived"""
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.arrived = 0
+        self.ready = asyncio.Event()
+
+    async def wait(self):
+        self.arrived += 1
+        if self.arrived == self.parties:
+            self.ready.set()
+        await asyncio.wait_for(self.ready.wait(), timeout=1)
+
+
+class RendezvousAgent(EchoAgent):
+    """Agent that only answers once every agent sharing its rendezvous has started"""
+
+    def __init__(self, agent_id, rendezvous):
+        super().__init__(agent_id)
+        self.rendezvous = rendezvous
+
+    async def _process_message(self, message, session_id, context):
+        await self.rendezvous.wait()
+        return await super()._process_message(message, session_id, context)
+
+
+async def make_manager(*agents):
+    """Create an agent manager holding the given agents"""
+    manager = AgentManager()
+    for agent in agents:
+        await manager.register_agent(agent)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_cyclic_workflow_entry_receives_raw_input():
+    """The entry node of a cycle is also fed from START, so it takes the raw input"""
+    manager = await make_manager(EchoAgent("first"), EchoAgent("second"))
+    workflow = MultiAgentWorkflow("cyclic", "Cyclic", agent_manager=manager)
+    workflow.add_node(WorkflowNode("n1", agent_id="first"))
+    workflow.add_node(WorkflowNode("n2", agent_id="second"))
+    workflow.add_edge("n1", "n2")
+    workflow.add_conditional_edge(
+        "n2",
+        lambda state: "again" if len(state["steps_completed"]) < 4 else "done",
+        {"again": "n1", "done": "__end__"}
+    )
+    workflow.compile()
+
+    assert workflow.nodes["n1"]._input_shape == "raw"
+    assert workflow.nodes["n2"]._input_shape == "message"
+
+    result = await workflow.execute({"query": "hello"})
+
+    assert result["status"] == "completed", result["error_message"]
+    assert result["steps_completed"] == ["n1", "n2", "n1", "n2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_workflow_keeps_completed_steps():
+    """A failing node reports the failed step along with the results before it"""
+    manager = await make_manager(EchoAgent("ok"), EchoAgent("bad", fail=True))
+    workflow = MultiAgentWorkflow("failing", "Failing", agent_manager=manager)
+    workflow.add_node(WorkflowNode("n1", agent_id="ok"))
+    workflow.add_node(WorkflowNode("n2", agent_id="bad"))
+    workflow.add_edge("n1", "n2")
+    workflow.finish_at("n2")
+    workflow.compile()
+
+    result = await workflow.execute({"message": "hi"})
+
+    assert result["status"] == "failed"
+    assert result["current_step"] == "n2"
+    assert "bad failed" in result["error_message"]
+    assert result["steps_completed"] == ["n1"]
+    assert result["agent_outputs"]["n1"]["response"] == "ok: hi"
+    assert "n2" not in result["agent_outputs"]
+
+
+def build_pipeline(workflow_id, manager):
+    """Two agent nodes in sequence, identical in shape for every call"""
+    workflow = MultiAgentWorkflow(workflow_id, "Pipeline", agent_manager=manager)
+    workflow.add_node(WorkflowNode("first", agent_type="echo"))
+    workflow.add_node(WorkflowNode("second", agent_id="closer"))
+    workflow.add_edge("first", "second")
+    workflow.finish_at("second")
+    return workflow.compile()
+
+
+@pytest.mark.asyncio
+async def test_shared_graph_keeps_workflows_isolated():
+    """Workflows sharing a compiled graph still run on their own agents and caches"""
+    left = build_pipeline("left", await make_manager(EchoAgent("left"), EchoAgent("closer")))
+    right = build_pipeline("right", await make_manager(EchoAgent("right"), EchoAgent("closer")))
+    assert left.compiled_graph is right.compiled_graph
+
+    left_result = await left.execute({"message": "hi"})
+    right_result = await right.execute({"message": "hi"})
+
+    assert left_result["agent_outputs"]["first"]["agent_id"] == "left"
+    assert right_result["agent_outputs"]["first"]["agent_id"] == "right"
+    assert right._agent_cache and left._agent_cache
+
+    right.invalidate_agent_cache()
+    assert not right._agent_cache
+    assert left._agent_cache
+
+
+@pytest.mark.asyncio
+async def test_node_tools_reinstalled_after_other_workflow():
+    """A shared agent gets a node's tools back after another workflow replaced them"""
+    agent = EchoAgent("shared")
+    manager = await make_manager(agent)
+    tools = {}
+    workflows = {}
+    for workflow_id in ("left", "right"):
+        tools[workflow_id] = StructuredTool.from_function(
+            lambda query: query, name="search", description=f"{workflow_id} search"
+        )
+        workflow = MultiAgentWorkflow(workflow_id, workflow_id, agent_manager=manager)
+        workflow.add_node(WorkflowNode("n1", agent_id="shared", tools=[tools[workflow_id]]))
+        workflow.finish_at("n1")
+        workflows[workflow_id] = workflow.compile()
+
+    for workflow_id in ("left", "right", "left"):
+        await workflows[workflow_id].execute({"message": "hi"})
+        assert agent.get_tool_by_name("search") is tools[workflow_id]
+
+
+@pytest.mark.asyncio
+async def test_type_pool_skips_weak_matches():
+    """Nodes bound to an agent type only rotate over agents of that type"""
+    mirror = EchoAgent("mirror")
+    mirror.agent_type = "mirror"
+    manager = await make_manager(EchoAgent("echo_a"), mirror, EchoAgent("echo_b"))
+    workflow = MultiAgentWorkflow("typed", "Typed", agent_manager=manager)
+    workflow.add_node(WorkflowNode("n1", agent_type="echo"))
+    workflow.finish_at("n1")
+    workflow.compile()
+
+    used = set()
+    for _ in range(4):
+        result = await workflow.execute({"message": "hi"})
+        used.add(result["agent_outputs"]["n1"]["agent_id"])
+
+    assert used == {"echo_a", "echo_b"}
+
+
+def test_document_workflows_share_compiled_graph():
+    """Builder workflows reuse one compiled graph instead of compiling per call"""
+    builder = WorkflowBuilder(agent_manager=AgentManager())
+    first = builder.create_document_processing_workflow("doc_a")
+    second = builder.create_document_processing_workflow("doc_b")
+    assert first.compiled_graph is second.compiled_graph
+
+    first = builder.create_multimodal_analysis_workflow("multimodal_a")
+    second = builder.create_multimodal_analysis_workflow("multimodal_b")
+    assert first.compiled_graph is second.compiled_graph
+
+
+@pytest.mark.asyncio
+async def test_command_route_sees_accumulated_state():
+    """Command routing reads reducer fields merged with the node's update"""
+    manager = await make_manager(EchoAgent("first"), EchoAgent("second"))
+    workflow = MultiAgentWorkflow("routed", "Routed", agent_manager=manager)
+    workflow.add_node(WorkflowNode("n1", agent_id="first"))
+    workflow.add_node(WorkflowNode("n2", agent_id="second"))
+    workflow.add_edge("n1", "n2")
+    seen = []
+
+    def route(state):
+        seen.append((list(state["steps_completed"]), sorted(state["agent_outputs"])))
+        return "done" if "n1" in state["agent_outputs"] else "retry"
+
+    workflow.route_with_command("n2", route, {"done": "__end__", "retry": "n1"})
+    workflow.compile()
+
+    result = await workflow.execute({"message": "hi"})
+
+    assert result["status"] == "completed", result["error_message"]
+    assert seen == [(["n1", "n2"], ["n1", "n2"])]
+
+
+@pytest.mark.asyncio
+async def test_parallel_nodes_run_concurrently():
+    """Edges into a grouped node run the whole group and continue at its join"""
+    rendezvous = Rendezvous(2)
+    manager = await make_manager(
+        EchoAgent("intake"),
+        RendezvousAgent("left", rendezvous),
+        RendezvousAgent("right", rendezvous),
+        EchoAgent("merger")
+    )
+    workflow = MultiAgentWorkflow("parallel", "Parallel", agent_manager=manager)
+    workflow.add_node(WorkflowNode("intake", agent_id="intake"))
+    workflow.add_node(WorkflowNode("left", agent_id="left"))
+    workflow.add_node(WorkflowNode("right", agent_id="right"))
+    workflow.add_node(WorkflowNode("merge", agent_id="merger"))
+    workflow.add_parallel_nodes(["left", "right"], join="merge")
+    workflow.add_edge("intake", "left")
+    workflow.finish_at("merge")
+    workflow.compile()
+
+    result = await workflow.execute({"message": "hi"})
+
+    assert result["status"] == "completed", result["error_message"]
+    assert result["steps_completed"] == ["intake", "left", "right", "merge"]
+    assert result["agent_outputs"]["merge"]["response"] == (
+        "merger: left: intake: hi\n\nright: intake: hi"
+    )
+
+
+def test_parallel_nodes_cannot_branch_individually():
+    """A grouped node has no edges of its own beyond the group's join"""
+    workflow = MultiAgentWorkflow("parallel", "Parallel", agent_manager=AgentManager())
+    for name in ("left", "right", "merge", "other"):
+        workflow.add_node(WorkflowNode(name, agent_type="echo"))
+    workflow.add_parallel_nodes(["left", "right"], join="merge")
+    workflow.add_edge("left", "other")
+
+    with pytest.raises(ValueError, match="join node"):
+        workflow.compile()